@@ -7,37 +7,39 @@ import random
 
 import pandas as pd
 from power_grid_model import CalculationType, initialize_array
-from power_grid_model.utils import json_deserialize
 from power_grid_model.validation import assert_valid_batch_data
 
+from power_system_simulation.input_data_validity_check import load_network_data
 
-def ev_penetration_calculation(
+
+def ev_penetration_calculation(  # pylint: disable=too-many-arguments
     model_ev,
     model_ev_arrays,
-    path_input_network_data: str,
+    input_network_data,
     path_ev_power_profile: str,
     path_meta_data: str,
     penetration_level_percentage: int,
     assert_valid_pwr_profile=False,
+    threads=0,
 ):
     """
     Perform EV (Electric Vehicle) penetration calculation based on input network data,
     EV power profiles, metadata, and penetration level percentage.
 
     Parameters:
-    - path_input_network_data (str): Path to the JSON file containing network data.
+    - input_network_data (dict, str or os.PathLike): Deserialized network data, or the path to its JSON file.
     - path_ev_power_profile (str): Path to the Parquet file containing EV power profiles.
     - path_meta_data (str): Path to the JSON file containing metadata.
     - penetration_level_percentage (int): Percentage of penetration level for EVs.
+    - threads (int): Number of threads for the batch power flow, 0 uses all hardware threads.
 
     Returns:
     - df_voltages (DataFrame): DataFrame containing aggregated voltage data.
     - df_line_loading (DataFrame): DataFrame containing aggregated line loading data.
     """
 
-    # Create array model of network
-    with open(path_input_network_data, encoding="utf-8") as ind:
-        input_network = json_deserialize(ind.read())
+    # Deserialize network data, only if a path was given
+    input_network = load_network_data(input_network_data)
     input_network_array_model = model_ev_arrays
 
     # Find list of LV feeders
@@ -102,7 +104,7 @@ def ev_penetration_calculation(
         )
 
     # Run model and aggregate results
-    model_ev.run_power_flow_calculation(update_data_calc=update_data, timestamps_given=timestamps_ev)
+    model_ev.run_power_flow_calculation(update_data_calc=update_data, timestamps_given=timestamps_ev, threads=threads)
     df_voltages = model_ev.aggregate_voltages()
     df_line_loading = model_ev.aggregate_line_loading()
 
@@ -14,7 +14,10 @@ The number of EV charging profile is at least the same as the number of sym_load
 
 """
 
+import copy
 import json
+import os
+from dataclasses import dataclass
 
 import numpy as np
 import pandas as pd
@@ -28,6 +31,9 @@ from power_system_simulation.pgm_calculation_module import (
     ProfileTimestampsNotMatchingError,
 )
 
+# keys of input file sets that passed validate_input_data, see _validation_cache_key
+_VALIDATION_CACHE = set()
+
 
 class MultipleTransformersError(Exception):
     """Error raised when LV grid has multiple transformers"""
@@ -55,10 +61,10 @@ class InsufficientEVchargingProfilesError(Exception):
 
 def validate_input_data(
     path_input_network_data: str,
-    path_active_power_profile=0,
-    path_reactive_power_profile=0,
-    path_ev_active_power_profile=0,
-    path_meta_data=0,
+    path_active_power_profile=None,
+    path_reactive_power_profile=None,
+    path_ev_active_power_profile=None,
+    path_meta_data=None,
     test_case=0,
 ):
     """Input data validity check:
@@ -75,6 +81,9 @@ def validate_input_data(
     The IDs in active load profile and reactive load profile are valid IDs of sym_load.
     The number of EV charging profile is at least the same as the number of sym_load.
 
+    Every input can be given as the path to its file or as the already loaded data: the deserialized network,
+    the profiles as pd.DataFrame and the meta data as dict.
+
     Args:
         path_input_network_data
         path_active_power_profile
@@ -94,28 +103,60 @@ def validate_input_data(
         ProfileLoadIDsNotMatchingError
         LoadProfileIDsNotSymLoadError
         InsufficientEVchargingProfilesError
+
+    Files that passed the check before and have not been modified since are not checked again, loaded data is
+    always checked.
     """
+    paths = (
+        path_input_network_data,
+        path_active_power_profile,
+        path_reactive_power_profile,
+        path_ev_active_power_profile,
+        path_meta_data,
+    )
+    # test cases modify the data after loading, so their outcome is never cached
+    if test_case != 0 or not all(isinstance(path, (str, os.PathLike)) for path in paths if path is not None):
+        _check_input_data(*paths, test_case)
+        return
+
+    cache_key = _validation_cache_key(*paths)
+    if cache_key not in _VALIDATION_CACHE:
+        _check_input_data(*paths, test_case)
+        _VALIDATION_CACHE.add(cache_key)
+
+
+def _check_input_data(
+    path_input_network_data,
+    path_active_power_profile,
+    path_reactive_power_profile,
+    path_ev_active_power_profile,
+    path_meta_data,
+    test_case,
+):
+    """Run all checks of validate_input_data on the given files or loaded data, without using the cache"""
     # deserialize json file of network
-    with open(path_input_network_data, encoding="utf-8") as ind:
-        input_network = json_deserialize(ind.read())
+    input_network = load_network_data(path_input_network_data)
 
-    if path_meta_data != 0:
+    if path_meta_data is not None:
         # deserialize json file of meta_data.json
-        with open(path_meta_data, encoding="utf-8") as metadata:
-            meta_data = json.load(metadata)
+        meta_data = _load_input(path_meta_data, _read_meta_data)
 
     # load parquet files of active and reactive power
-    if path_active_power_profile != 0:
-        active_power_profile = pd.read_parquet(path_active_power_profile)
-    if path_reactive_power_profile != 0:
-        reactive_power_profile = pd.read_parquet(path_reactive_power_profile)
+    if path_active_power_profile is not None:
+        active_power_profile = _load_input(path_active_power_profile, pd.read_parquet)
+    if path_reactive_power_profile is not None:
+        reactive_power_profile = _load_input(path_reactive_power_profile, pd.read_parquet)
 
     # load parquet files of ev active power profile
-    if path_ev_active_power_profile != 0:
-        ev_power_profile = pd.read_parquet(path_ev_active_power_profile)
+    if path_ev_active_power_profile is not None:
+        ev_power_profile = _load_input(path_ev_active_power_profile, pd.read_parquet)
 
     # change data, for testing only, if ALL data types are provided
     if test_case != 0:
+        # the test cases change the data in place, loaded data of the caller must stay as it is
+        input_network, active_power_profile, reactive_power_profile, ev_power_profile, meta_data = copy.deepcopy(
+            (input_network, active_power_profile, reactive_power_profile, ev_power_profile, meta_data)
+        )
         if change_data_for_test:
             input_network, active_power_profile, reactive_power_profile, ev_power_profile, meta_data = (
                 change_data_for_test(
@@ -138,7 +179,7 @@ def validate_input_data(
             "LV grid does not have exactly one transfromer but instead has: " + str(len(input_network["source"]))
         )
 
-    if path_meta_data != 0:
+    if path_meta_data is not None:
         # check for: lines in the LV Feeder IDs have the from_node the same as the to_node of the transformer
         to_node_transformer = input_network["transformer"][0][2]
         for i in meta_data["lv_feeders"]:
@@ -155,13 +196,13 @@ def validate_input_data(
             if i not in input_network_line_ids:
                 raise InvalidFeederIDError("LV feeder IDs are not valid line IDs")
 
-    if 0 not in (path_active_power_profile, path_reactive_power_profile):
+    if path_active_power_profile is not None and path_reactive_power_profile is not None:
         # check for matching timestamps in load profiles:
         if not active_power_profile.index.equals(reactive_power_profile.index):
             raise ProfileTimestampsNotMatchingError("Timestamps of active and reactive power profile do not match!")
 
         # check for: matching IDs in active and reactive load profile:
-        if (active_power_profile.columns != reactive_power_profile.columns).any():
+        if not active_power_profile.columns.equals(reactive_power_profile.columns):
             raise ProfileLoadIDsNotMatchingError("Load IDs of active and reactive power do not match!")
 
         # check for: The IDs in active load profile and reactive load profile are valid IDs of sym_load
@@ -173,12 +214,12 @@ def validate_input_data(
                     "The IDs in active load profile and reactive load profile are not valid IDs of sym_load"
                 )
 
-    if 0 not in (path_active_power_profile, path_ev_active_power_profile):
+    if path_active_power_profile is not None and path_ev_active_power_profile is not None:
         # check for matching timestamps in load profiles:
         if not active_power_profile.index.equals(ev_power_profile.index):
             raise ProfileTimestampsNotMatchingError("Timestamps of active and EV power profile do not match!")
 
-    if path_ev_active_power_profile != 0:
+    if path_ev_active_power_profile is not None:
         # check for: The number of EV charging profile is at least the same as the number of sym_load
         if (ev_power_profile.shape[1]) < len(input_network["sym_load"]):
             raise InsufficientEVchargingProfilesError(
@@ -190,6 +231,53 @@ def validate_input_data(
     GraphProcessor(vertex_ids, edge_ids, edge_vertex_id_pairs, edge_enabled, source_vertex_id)
 
 
+def load_network_data(input_network_data):
+    """Function to return deserialized network data, reading the JSON file only if a path was given
+
+    Args:
+        input_network_data (dict, str or os.PathLike): deserialized network data, or the path to its JSON file
+
+    Returns:
+        dict: deserialized network data
+    """
+    return _load_input(input_network_data, _read_network_data)
+
+
+def _load_input(data, read_file):
+    """Read data from file with read_file if data is a path (str or os.PathLike), otherwise it is already loaded"""
+    if isinstance(data, (str, os.PathLike)):
+        return read_file(data)
+    return data
+
+
+def _read_network_data(path_input_network_data):
+    """Deserialize json file of network"""
+    with open(path_input_network_data, encoding="utf-8") as ind:
+        return json_deserialize(ind.read())
+
+
+def _read_meta_data(path_meta_data):
+    """Deserialize json file of meta data"""
+    with open(path_meta_data, encoding="utf-8") as metadata:
+        return json.load(metadata)
+
+
+def _validation_cache_key(*paths):
+    """
+    Identify a set of input files by path, modification time and size, so a modified file invalidates the
+    cached validation result. Paths that are not provided are kept as None.
+    """
+    key = []
+    for path in paths:
+        if path is None:
+            key.append(None)
+        else:
+            path = os.fspath(path)
+            stat = os.stat(path)
+            key.append((os.path.abspath(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(key)
+
+
 def reformat_pgm_to_array(input_network_data):
     """
     change pgm format style to array format used in 'graph_processing.py', used for checking input data,
@@ -221,6 +309,150 @@ def reformat_pgm_to_array(input_network_data):
 
 
 # changing data for datasets:
+def _append_copy_of_first(component_data, new_id):
+    """Function to return a new array with a copy of the first component, with a new ID, appended to it
+
+    Args:
+        component_data (np.ndarray): structured PGM array of one component type
+        new_id (int): ID of the appended component
+
+    Returns:
+        np.ndarray: structured array with the same dtype and one more component
+    """
+    extended = np.empty(len(component_data) + 1, dtype=component_data.dtype)
+    extended[:-1] = component_data
+    extended[-1] = component_data[0]
+    extended[-1]["id"] = new_id
+    return extended
+
+
+def _relabel(labels, old_label, new_label):
+    """Function to return a copy of a pandas index in which a label is replaced
+
+    Args:
+        labels (pd.Index): index or columns of a profile
+        old_label: label to replace
+        new_label: label to replace it with
+
+    Returns:
+        pd.Index: new index with the same name
+    """
+    values = labels.to_numpy(copy=True)
+    values[labels == old_label] = new_label
+    return pd.Index(values, name=labels.name)
+
+
+@dataclass
+class _TestCaseData:
+    """Input data changed by the functions of the test cases of change_data_for_test"""
+
+    input_network: dict
+    active_power_profile: pd.DataFrame
+    reactive_power_profile: pd.DataFrame
+    ev_power_profile: pd.DataFrame
+    meta_data: dict
+
+
+def _max_id(input_network):
+    """Function to return the highest ID of all components in the network"""
+    return int(max(component_data["id"].max() for component_data in input_network.values() if component_data.size))
+
+
+def _duplicate_node_id(data):
+    """Test case 1: LV grid is not valid PGM input data"""
+    data.input_network["node"][0]["id"] = data.input_network["node"][1]["id"]
+
+
+def _second_transformer(data):
+    """Test case 2: LV grid has more than one transformer"""
+    data.input_network["transformer"] = _append_copy_of_first(
+        data.input_network["transformer"], _max_id(data.input_network) + 1
+    )
+
+
+def _second_source(data):
+    """Test case 3: LV grid has more than one source"""
+    data.input_network["source"] = _append_copy_of_first(data.input_network["source"], _max_id(data.input_network) + 1)
+
+
+def _invalid_feeder_id(data):
+    """Test case 4: IDs in LV feeder IDs are not valid line IDs"""
+    data.meta_data["lv_feeders"][0] = _max_id(data.input_network) + 1
+
+
+def _feeder_not_at_transformer(data):
+    """Test case 5: Lines in LV feeder IDs do not have the same from_node as the to_node of the transformer"""
+    to_node_transformer_false = data.input_network["transformer"]["to_node"][0] + 1
+    feeder_lines = np.flatnonzero(data.input_network["line"]["id"] == data.meta_data["lv_feeders"][0])
+    if feeder_lines.size:
+        feeder_line = data.input_network["line"][feeder_lines[0]]
+        if to_node_transformer_false == feeder_line["to_node"]:
+            to_node_transformer_false = to_node_transformer_false + 1
+        feeder_line["from_node"] = to_node_transformer_false
+
+
+def _disconnect_feeders(data):
+    """Test case 6: The grid is not fully connected in initial state"""
+    feeder_lines = np.isin(data.input_network["line"]["id"], np.asarray(data.meta_data["lv_feeders"]))
+    data.input_network["line"]["to_status"][feeder_lines] = 0
+
+
+def _connect_all_lines(data):
+    """Test case 7: The grid is cyclic in initial state"""
+    data.input_network["line"]["from_status"] = 1
+    data.input_network["line"]["to_status"] = 1
+
+
+def _reactive_timestamp_mismatch(data):
+    """Test case 8: Timestamps between active and reactive profile do not match"""
+    index = data.reactive_power_profile.index
+    data.reactive_power_profile.index = _relabel(index, index[0], np.datetime64("2000-01-01T00:00:00"))
+
+
+def _ev_timestamp_mismatch(data):
+    """Test case 9: Timestamps between active and EV profile do not match"""
+    index = data.ev_power_profile.index
+    data.ev_power_profile.index = _relabel(index, index[0], np.datetime64("2000-01-01T00:00:00"))
+
+
+def _profile_id_mismatch(data):
+    """Test case 10: IDs in active and reactive profile do not match"""
+    act_columns = data.active_power_profile.columns
+    data.active_power_profile.columns = _relabel(act_columns, act_columns[0], act_columns.max() + 1)
+
+
+def _profile_id_not_sym_load(data):
+    """Test case 11: IDs in active (and reactive) load profile are not valid sym_load IDs"""
+    sym_load_id_wrong = _max_id(data.input_network) + 1
+    act_columns = data.active_power_profile.columns
+    data.active_power_profile.columns = _relabel(act_columns, act_columns[0], sym_load_id_wrong)
+    data.reactive_power_profile.columns = _relabel(
+        data.reactive_power_profile.columns, act_columns[0], sym_load_id_wrong
+    )
+
+
+def _drop_ev_profile(data):
+    """Test case 12: the number of EV charging profiles is lower than the number of sym_load"""
+    data.ev_power_profile = data.ev_power_profile.drop(data.ev_power_profile.columns[-1], axis=1)
+
+
+# function that changes the data, per test case of change_data_for_test
+_TEST_CASES = {
+    1: _duplicate_node_id,
+    2: _second_transformer,
+    3: _second_source,
+    4: _invalid_feeder_id,
+    5: _feeder_not_at_transformer,
+    6: _disconnect_feeders,
+    7: _connect_all_lines,
+    8: _reactive_timestamp_mismatch,
+    9: _ev_timestamp_mismatch,
+    10: _profile_id_mismatch,
+    11: _profile_id_not_sym_load,
+    12: _drop_ev_profile,
+}
+
+
 def change_data_for_test(
     input_network, active_power_profile, reactive_power_profile, ev_power_profile, meta_data, test_case
 ):
@@ -239,56 +471,14 @@ def change_data_for_test(
     11: IDs in active load (and reactive) load profile are valid sym_load IDs
     12: the number of EV charging profile is not the same as or higher than the number of sym_load
     """
-    all_ids = []
-    for i in input_network:
-        for n in input_network[i]:
-            all_ids.append(n[0])
-    max_id = max(all_ids)
-
-    if test_case == 1:
-        input_network["node"][0][0] = input_network["node"][1][0]
-    if test_case == 2:
-        input_network["transformer"] = np.append(input_network["transformer"], input_network["transformer"][0])
-        input_network["transformer"][1][0] = max_id + 1
-    if test_case == 3:
-        input_network["source"] = np.append(input_network["source"], input_network["source"][0])
-        input_network["source"][1][0] = max_id + 1
-    if test_case == 4:
-        meta_data["lv_feeders"][0] = max_id + 1
-    if test_case == 5:
-        to_node_transformer_false = input_network["transformer"][0][2] + 1
-        for i in input_network["line"]:
-            if i[0] == meta_data["lv_feeders"][0]:
-                if to_node_transformer_false == i[2]:
-                    to_node_transformer_false = to_node_transformer_false + 1
-                i[1] = to_node_transformer_false
-                break
-    if test_case == 6:
-        for i in meta_data["lv_feeders"]:
-            for n in input_network["line"]:
-                if n[0] == i:
-                    n[4] = 0
-    if test_case == 7:
-        for i in input_network["line"]:
-            i[3] = 1
-            i[4] = 1
-    if test_case == 8:
-        reactive_power_profile.rename(
-            index={pd.Timestamp(reactive_power_profile.index[0]): pd.Timestamp("2000-01-01 00:00:00")}, inplace=True
-        )
-    if test_case == 9:
-        ev_power_profile.rename(
-            index={pd.Timestamp(ev_power_profile.index[0]): pd.Timestamp("2000-01-01 00:00:00")}, inplace=True
-        )
-    if test_case == 10:
-        act_columns = active_power_profile.columns
-        active_power_profile = active_power_profile.rename(columns={act_columns[0]: (max(act_columns) + 1)})
-    if test_case == 11:
-        sym_load_id_wrong = max_id + 1
-        act_columns = active_power_profile.columns
-        active_power_profile = active_power_profile.rename(columns={act_columns[0]: sym_load_id_wrong})
-        reactive_power_profile = reactive_power_profile.rename(columns={act_columns[0]: sym_load_id_wrong})
-    if test_case == 12:
-        ev_power_profile = ev_power_profile.drop(ev_power_profile.columns[-1], axis=1)
-
-    return input_network, active_power_profile, reactive_power_profile, ev_power_profile, meta_data
+    data = _TestCaseData(input_network, active_power_profile, reactive_power_profile, ev_power_profile, meta_data)
+    if test_case in _TEST_CASES:
+        _TEST_CASES[test_case](data)
+    # not dataclasses.astuple, that would deep-copy all data once more
+    return (
+        data.input_network,
+        data.active_power_profile,
+        data.reactive_power_profile,
+        data.ev_power_profile,
+        data.meta_data,
+    )
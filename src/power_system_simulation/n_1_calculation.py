@@ -2,7 +2,7 @@
 
 import numpy as np
 import pandas as pd
-from power_grid_model import initialize_array
+from power_grid_model import CalculationMethod, initialize_array
 
 
 class InvalidLineIDError(Exception):
@@ -11,7 +11,10 @@ class InvalidLineIDError(Exception):
 
 def n_1_calculation_module(model_n1, input_network_array_model, line_id_disconnect, reset_model_once_done=False):
     """provides a alternative grid topology when an line is disconnected
-    takes and line id"""
+    takes and line id
+
+    The scenarios run on a clone of model_n1. Unless reset_model_once_done is set, the line stays disconnected
+    in model_n1 afterwards, the alternative lines are never connected in model_n1."""
     # first error handling:
     line_id_index = np.where(input_network_array_model.edge_ids == line_id_disconnect)[0]
     if line_id_index.size > 0:
@@ -19,8 +22,11 @@ def n_1_calculation_module(model_n1, input_network_array_model, line_id_disconne
     else:
         raise InvalidLineIDError("Line ID to disconnect is not a valid line ID!")
 
-    # update model
+    # update a copy of the model, the given model keeps its state during the scenarios
     update_line_data = create_line_update_data(line_id_disconnect, 0)
+    if not reset_model_once_done:
+        model_n1.update_model(update_line_data)
+    model_n1 = model_n1.clone()
     model_n1.update_model(update_line_data)
 
     # find alternative edges:
@@ -40,19 +46,15 @@ def n_1_calculation_module(model_n1, input_network_array_model, line_id_disconne
 
         # run calculation
         model_n1.run_power_flow_calculation()
-        max_line_loading = model_n1.aggregate_line_loading()
+        max_line_loading = model_n1.aggregate_line_loading_arrays()
 
         # find maximum and create table row
-        max_index = max_line_loading["Max_Loading"].idxmax()
-        max_loading_timestamp = max_line_loading.at[max_index, "Max_Loading_Timestamp"]
-        max_loading = max_line_loading.at[max_index, "Max_Loading"]
+        max_position = np.argmax(max_line_loading["Max_Loading"])
+        max_index = max_line_loading["Line_ID"][max_position]
+        max_loading_timestamp = max_line_loading["Max_Loading_Timestamp"][max_position]
+        max_loading = max_line_loading["Max_Loading"][max_position]
         result_table_list.append([alt_edge_id, max_loading, max_index, max_loading_timestamp])
 
-    # reset last tested alternative edge:
-    if previous_line_id is not None:
-        update_line_data = create_line_update_data(previous_line_id, 0)
-        model_n1.update_model(update_line_data)
-
     max_min_line_loading_df_columns = [
         "Alternative_Line_ID",
         "Max_Loading",
@@ -62,10 +64,70 @@ def n_1_calculation_module(model_n1, input_network_array_model, line_id_disconne
     result_table = pd.DataFrame(result_table_list, columns=max_min_line_loading_df_columns)
     result_table.set_index("Alternative_Line_ID", inplace=True)
 
-    # reset disabled edge to enabled again
-    if reset_model_once_done:
-        update_line_data = create_line_update_data(line_id_disconnect, 0)
-        model_n1.update_model(update_line_data)
+    return result_table
+
+
+def n_1_calculation_batch_module(model_n1, input_network_array_model, line_ids_disconnect, threads=0):
+    """provides the alternative grid topologies for several disconnected lines at once
+
+    Every combination of a disconnected line and one of its alternative lines is a scenario. All scenarios
+    are stacked with the time-series load profile into a single batch, so power-grid-model can solve them
+    in parallel. The model itself is not updated, so no reset is needed afterwards.
+    Note that the batch holds (number of scenarios x number of timestamps) rows."""
+    # first error handling and collecting the scenarios:
+    scenarios = []
+    for line_id_disconnect in line_ids_disconnect:
+        if line_id_disconnect not in input_network_array_model.edge_ids:
+            raise InvalidLineIDError("Line ID to disconnect is not a valid line ID!")
+        for alt_edge_id in input_network_array_model.find_alternative_edges(line_id_disconnect):
+            scenarios.append([line_id_disconnect, alt_edge_id])
+    scenarios = np.array(scenarios, dtype=np.int64).reshape(-1, 2)
+
+    max_min_line_loading_df_columns = [
+        "Disconnected_Line_ID",
+        "Alternative_Line_ID",
+        "Max_Loading",
+        "Max_Loading_Line_ID",
+        "Max_Loading_Timestamp",
+    ]
+    if scenarios.shape[0] == 0:
+        result_table = pd.DataFrame(columns=max_min_line_loading_df_columns)
+        return result_table.set_index(["Disconnected_Line_ID", "Alternative_Line_ID"])
+
+    # create batch update data, time-series is repeated for every scenario:
+    sym_load_profile = model_n1.update_data["sym_load"]
+    n_scenarios, n_timestamps = scenarios.shape[0], sym_load_profile.shape[0]
+
+    update_line_dt = initialize_array("update", "line", (n_scenarios * n_timestamps, 2))
+    update_line_dt["id"] = np.repeat(scenarios, n_timestamps, axis=0)
+    update_line_dt["from_status"] = [0, 1]
+    update_line_dt["to_status"] = [0, 1]
+    update_data = {"sym_load": np.tile(sym_load_profile, (n_scenarios, 1)), "line": update_line_dt}
+
+    # run all scenarios in one batch calculation
+    output_data = model_n1.model.calculate_power_flow(
+        update_data=update_data,
+        calculation_method=CalculationMethod.newton_raphson,
+        threading=threads,
+        output_component_types={"line"},
+    )
+
+    # find maximum loading of every scenario over all timestamps and lines
+    line_loading = output_data["line"]["loading"].reshape(n_scenarios, -1)
+    line_ids = output_data["line"]["id"][0]
+    max_flat_indices = np.argmax(line_loading, axis=1)
+    max_timestamp_indices, max_line_indices = np.divmod(max_flat_indices, line_ids.size)
+
+    result_table = pd.DataFrame(
+        {
+            "Disconnected_Line_ID": scenarios[:, 0],
+            "Alternative_Line_ID": scenarios[:, 1],
+            "Max_Loading": line_loading[np.arange(n_scenarios), max_flat_indices],
+            "Max_Loading_Line_ID": line_ids[max_line_indices],
+            "Max_Loading_Timestamp": model_n1.timestamps_ns[max_timestamp_indices],
+        }
+    )
+    result_table.set_index(["Disconnected_Line_ID", "Alternative_Line_ID"], inplace=True)
 
     return result_table
 
@@ -0,0 +1,121 @@
+"""
+Optional Numba kernels for reducing raw power-grid-model output arrays.
+
+Numba is not a required dependency (install it with the ``numba`` extra). When it is not installed,
+NUMBA_AVAILABLE is False and njit is a no-op decorator, so the kernels can still be imported and tested as
+plain Python functions. Callers should only dispatch to a kernel when NUMBA_AVAILABLE is True and use the
+equivalent NumPy expression otherwise.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):  # pylint: disable=unused-argument
+        """Fallback for numba.njit that returns the decorated function unchanged"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def voltage_deviation_kernel(u_pu):
+    """
+    Average voltage deviation over all timestamps.
+
+    For every timestamp the deviation is the mean of (max(u_pu) - 1) and (min(u_pu) - 1) over the nodes,
+    the result is the mean of this deviation over all timestamps.
+
+    Args:
+        u_pu (np.ndarray): node voltages in p.u. with shape (timestamps, nodes)
+
+    Returns:
+        float: average voltage deviation
+    """
+    n_timestamps, n_nodes = u_pu.shape
+    deviation_sum = 0.0
+    for t in range(n_timestamps):
+        u_max = u_pu[t, 0]
+        u_min = u_pu[t, 0]
+        for j in range(1, n_nodes):
+            u_node = u_pu[t, j]
+            u_max = max(u_max, u_node)
+            u_min = min(u_min, u_node)
+        deviation_sum += (u_max - 1.0) + (u_min - 1.0)
+    return 0.5 * deviation_sum / n_timestamps
+
+
+@njit(cache=True, fastmath=True)
+def line_reduction_kernel(loading, p_from, p_to, weights):
+    """
+    Timestamp indices of the maximum and minimum loading and the energy losses of every line, in a single pass.
+
+    Equivalent to np.argmax(loading, axis=0), np.argmin(loading, axis=0) and weights @ np.abs(p_from + p_to) / 1000,
+    without allocating the intermediate (timestamps, lines) array. The first index wins on ties. The kernel runs
+    on the calling thread: a single batch is too small to gain from a thread pool.
+
+    Args:
+        loading (np.ndarray): loading of the lines, shape (timestamps, lines), at least one timestamp
+        p_from (np.ndarray): active power flowing into the lines at the from side in W, shape (timestamps, lines)
+        p_to (np.ndarray): active power flowing into the lines at the to side in W, shape (timestamps, lines)
+        weights (np.ndarray): integration weight of every timestamp in hours, shape (timestamps,)
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: indices of the maximum and of the minimum loading, and the
+        energy losses per line in kWh, shape (lines,)
+    """
+    n_timestamps, n_lines = loading.shape
+    max_indices = np.zeros(n_lines, dtype=np.int64)
+    min_indices = np.zeros(n_lines, dtype=np.int64)
+    losses = np.zeros(n_lines)
+    for line in range(n_lines):
+        t_max = 0
+        t_min = 0
+        energy = weights[0] * abs(p_from[0, line] + p_to[0, line])
+        for t in range(1, n_timestamps):
+            value = loading[t, line]
+            if value > loading[t_max, line]:
+                t_max = t
+            elif value < loading[t_min, line]:
+                t_min = t
+            energy += weights[t] * abs(p_from[t, line] + p_to[t, line])
+        max_indices[line] = t_max
+        min_indices[line] = t_min
+        losses[line] = energy / 1000
+    return max_indices, min_indices, losses
+
+
+@njit(cache=True)
+def row_argmax_argmin_kernel(values):
+    """
+    Column indices of the maximum and minimum of every row, in a single pass over the array.
+
+    Equivalent to (np.argmax(values, axis=1), np.argmin(values, axis=1)), the first index wins on ties.
+    Like line_reduction_kernel it runs on the calling thread.
+
+    Args:
+        values (np.ndarray): array with shape (rows, columns), at least one column
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: indices of the maximum and of the minimum, shape (rows,)
+    """
+    n_rows, n_columns = values.shape
+    max_indices = np.zeros(n_rows, dtype=np.int64)
+    min_indices = np.zeros(n_rows, dtype=np.int64)
+    for row in range(n_rows):
+        i_max = 0
+        i_min = 0
+        for j in range(1, n_columns):
+            value = values[row, j]
+            if value > values[row, i_max]:
+                i_max = j
+            elif value < values[row, i_min]:
+                i_min = j
+        max_indices[row] = i_max
+        min_indices[row] = i_min
+    return max_indices, min_indices
@@ -7,7 +7,9 @@ system network. The main goal is to achieve optimal power distribution by adjust
 
 import numpy as np
 from power_grid_model import initialize_array
-from power_grid_model.utils import json_deserialize
+
+from power_system_simulation.input_data_validity_check import load_network_data
+from power_system_simulation.numba_kernels import NUMBA_AVAILABLE, voltage_deviation_kernel
 
 
 class InvalidMode(Exception):
@@ -16,18 +18,19 @@ class InvalidMode(Exception):
 
 def optimal_tap_pos(
     model,
-    input_network_data: str,
+    input_network_data,
     mode=0,
-    number_threads=1,
+    number_threads=0,
 ):
     """
         Determines the optimal tap position for transformers in a power system network.
 
     Args:
-        input_network_data (str): Path to the network configuration data file in JSON format.
+        input_network_data (dict, str or os.PathLike): Deserialized network data, or the path to its JSON file.
         path_active_power_profile (str): Path to the active power profile data file in Parquet format.
         path_reactive_power_profile (str): Path to the reactive power profile data file in Parquet format.
         mode (int, optional): Optimization mode; 0 for minimum voltage deviation, 1 for minimum losses. Default is 0.
+        number_threads (int, optional): Number of threads for each batch power flow, 0 uses all hardware threads.
 
     Returns:
         int: The optimal tap position.
@@ -35,16 +38,20 @@ def optimal_tap_pos(
     Raises:
         InvalidMode: If the mode is not 0 or 1.
 
-    This function processes the input network data and power profiles, and uses the `pgm_calculation` function
-    to obtain data frames containing max and min voltages, and line losses. It then determines the optimal
-    position by iterating through all possible tap positions, comparing voltage deviations or losses as per the mode
+    This function processes the input network data and power profiles, and uses the given `PGMcalculation` model
+    to obtain the node voltages and line losses. It then determines the optimal
+    position by iterating through all possible tap positions, comparing voltage deviations or losses as per the mode.
+    Afterwards the transformer of the model is set back to the tap position of the input network data.
     """
 
     if mode not in [0, 1]:
         raise InvalidMode("Mode must either be 0 or 1")
 
-    with open(input_network_data, encoding="utf-8") as ind:
-        input_data = json_deserialize(ind.read())
+    # pick the objective once so the sweep itself does not branch on the mode
+    objective = _voltage_objective if mode == 0 else _loss_objective
+
+    # Deserialize network data, only if a path was given
+    input_data = load_network_data(input_network_data)
 
     min_pos = np.take(input_data["transformer"]["tap_min"], 0)
     max_pos = np.take(input_data["transformer"]["tap_max"], 0)
@@ -57,40 +64,50 @@ def optimal_tap_pos(
 
     transformer_id = model_tap.input_data["transformer"][0]["id"]
 
-    optimal_tap_pos_value = 0
-
-    for tap_pos in range(min_pos, max_pos + 1):
-        # create model update data:
-        update_tap_pos = initialize_array("update", "transformer", 1)
-        update_tap_pos["id"] = transformer_id
-        update_tap_pos["tap_pos"] = [tap_pos]
-        update_tap_data = {"transformer": update_tap_pos}
-
-        model_tap.update_model(update_tap_data)
-        model_tap.run_power_flow_calculation(threads=number_threads)
-
-        if mode == 0:
-            voltage_df = model_tap.aggregate_voltages()
-        else:
-            loading_df = model_tap.aggregate_line_loading()
-
-        if mode == 0:
-            avg_voltage_deviation = ((voltage_df[["Max_Voltage", "Min_Voltage"]] - 1).mean(axis=1)).mean()
-
-            if tap_pos == min_pos:
-                min_deviation_value = avg_voltage_deviation
-                optimal_tap_pos_value = tap_pos
-            elif avg_voltage_deviation < min_deviation_value:
-                min_deviation_value = avg_voltage_deviation
-                optimal_tap_pos_value = tap_pos
-
-        elif mode == 1:
-            total_losses_tap = sum(loading_df["Total_Loss"])
-            if tap_pos == min_pos:
-                total_losses_min = total_losses_tap
-                optimal_tap_pos_value = tap_pos
-            elif total_losses_tap < total_losses_min:
-                total_losses_min = total_losses_tap
-                optimal_tap_pos_value = tap_pos
+    tap_positions = range(min_pos, max_pos + 1)
+
+    # the tap positions are evaluated one after another in this process, every batch power flow is parallelized
+    # by power-grid-model itself
+    metrics = np.empty(len(tap_positions))
+    for i, tap_pos in enumerate(tap_positions):
+        metrics[i] = _tap_metric(model_tap, transformer_id, tap_pos, objective, number_threads)
+
+    # leave the model as it was given, not at the last evaluated tap position
+    _set_tap_pos(model_tap, transformer_id, np.take(input_data["transformer"]["tap_pos"], 0))
+
+    # first minimum wins, identical to keeping the lowest tap position on ties
+    optimal_tap_pos_value = min_pos + int(np.argmin(metrics))
 
     return optimal_tap_pos_value
+
+
+def _set_tap_pos(model_tap, transformer_id, tap_pos):
+    """Set the transformer of the model to tap_pos"""
+    update_tap_pos = initialize_array("update", "transformer", 1)
+    update_tap_pos["id"] = transformer_id
+    update_tap_pos["tap_pos"] = [tap_pos]
+    model_tap.update_model({"transformer": update_tap_pos})
+
+
+def _tap_metric(model_tap, transformer_id, tap_pos, objective, number_threads):
+    """Set the transformer to tap_pos, run the batch power flow and return the objective"""
+    _set_tap_pos(model_tap, transformer_id, tap_pos)
+    model_tap.run_power_flow_calculation(threads=number_threads)
+    return objective(model_tap)
+
+
+# metrics are only compared against each other, so the reductions run in float32;
+# the caller stores them as float64 to avoid spurious ties in the final argmin
+def _voltage_objective(model_tap) -> float:
+    """Average voltage deviation of the last power flow calculation (mode 0)"""
+    u_pu = model_tap.output_data["node"]["u_pu"].astype(np.float32, copy=False)
+    if NUMBA_AVAILABLE:
+        return voltage_deviation_kernel(u_pu)
+    voltage_deviation = (u_pu.max(axis=1) + u_pu.min(axis=1)) / 2 - 1
+    return voltage_deviation.mean()
+
+
+def _loss_objective(model_tap) -> float:
+    """Total line losses of the last power flow calculation (mode 1)"""
+    total_loss = model_tap.aggregate_line_loading_arrays()["Total_Loss"]
+    return total_loss.astype(np.float32, copy=False).sum()
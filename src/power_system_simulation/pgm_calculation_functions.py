@@ -1,17 +1,15 @@
 """
-This module provides the PGMfunctions class which includes methods for creating a PGM model, 
-validating input data, creating batch update data, calculating EV penetration levels, performing 
+This module provides the PGMfunctions class which includes methods for creating a PGM model,
+validating input data, creating batch update data, calculating EV penetration levels, performing
 N-1 calculations, and finding optimal tap positions in a power grid model.
 
 It also defines custom exceptions for handling missing profile data.
 """
 
-from power_grid_model.utils import json_deserialize
-
 from power_system_simulation.ev_penetration_level import ev_penetration_calculation
 from power_system_simulation.graph_processing import GraphProcessor
 from power_system_simulation.input_data_validity_check import reformat_pgm_to_array, validate_input_data
-from power_system_simulation.n_1_calculation import n_1_calculation_module
+from power_system_simulation.n_1_calculation import n_1_calculation_batch_module, n_1_calculation_module
 from power_system_simulation.optimal_tap_position import optimal_tap_pos
 from power_system_simulation.pgm_calculation_module import PGMcalculation
 
@@ -38,8 +36,8 @@ class PGMfunctions:
 
     Methods
     -------
-    __init__(self, path_input_network_data, path_active_power_profile=0,
-    path_reactive_power_profile=0, path_ev_active_power_profile=0, path_meta_data=0)
+    __init__(self, path_input_network_data, path_active_power_profile=None,
+    path_reactive_power_profile=None, path_ev_active_power_profile=None, path_meta_data=None)
         Initializes the PGMfunctions class with paths to data.
 
     create_pgm_model(self)
@@ -48,28 +46,31 @@ class PGMfunctions:
     input_data_validity_check(self, test_case=0)
         Validates the input data paths and raises appropriate exceptions if any path is missing.
 
-    create_batch_update_data(self, path_active_power_profile=0, path_reactive_power_profile=0)
+    create_batch_update_data(self, path_active_power_profile=None, path_reactive_power_profile=None)
         Creates batch update data using the provided active and reactive power profiles.
 
-    ev_penetration_level(self, penetration_level_percentage, path_ev_power_profile=0,
-    path_meta_data=0, assert_valid_pwr_profile=False)
+    ev_penetration_level(self, penetration_level_percentage, path_ev_power_profile=None,
+    path_meta_data=None, assert_valid_pwr_profile=False, threads=0)
         Calculates the EV penetration level based on the provided data.
 
     n_1_calculation(self, line_id_disconnect, reset_model_once_done=False)
         Performs N-1 calculation for a given line disconnection.
 
-    find_optimal_tap_position(self, optimization_mode=0, path_active_power_profile=0,
-    path_reactive_power_profile=0, threads=1)
+    n_1_calculation_batch(self, line_ids_disconnect, threads=0)
+        Performs N-1 calculations for several line disconnections in one batch calculation.
+
+    find_optimal_tap_position(self, optimization_mode=0, path_active_power_profile=None,
+    path_reactive_power_profile=None, threads=0)
         Finds the optimal tap position based on the provided data and optimization mode.
     """
 
     def __init__(
         self,
         path_input_network_data: str,
-        path_active_power_profile=0,
-        path_reactive_power_profile=0,
-        path_ev_active_power_profile=0,
-        path_meta_data=0,
+        path_active_power_profile=None,
+        path_reactive_power_profile=None,
+        path_ev_active_power_profile=None,
+        path_meta_data=None,
     ):
         """
         Initializes the PGMfunctions class with paths to data.
@@ -79,13 +80,13 @@ class PGMfunctions:
         path_input_network_data : str
             Path to the input network data file.
         path_active_power_profile : str, optional
-            Path to the active power profile file (default is 0).
+            Path to the active power profile file (default is None).
         path_reactive_power_profile : str, optional
-            Path to the reactive power profile file (default is 0).
+            Path to the reactive power profile file (default is None).
         path_ev_active_power_profile : str, optional
-            Path to the EV active power profile file (default is 0).
+            Path to the EV active power profile file (default is None).
         path_meta_data : str, optional
-            Path to the meta data file (default is 0).
+            Path to the meta data file (default is None).
         """
         self.path_input_network_data = path_input_network_data
         self.path_active_power_profile = path_active_power_profile
@@ -104,11 +105,9 @@ class PGMfunctions:
         self.model = PGMcalculation()
         self.model.create_pgm(self.path_input_network_data)
 
-        # Create array model of network
-        with open(self.path_input_network_data, encoding="utf-8") as ind:
-            input_network = json_deserialize(ind.read())
+        # Create array model of network, reusing the input data deserialized by create_pgm
         vertex_ids, edge_ids, edge_vertex_id_pairs, edge_enabled, source_vertex_id = reformat_pgm_to_array(
-            input_network
+            self.model.input_data
         )
         self.input_network_array_model = GraphProcessor(
             vertex_ids, edge_ids, edge_vertex_id_pairs, edge_enabled, source_vertex_id
@@ -140,40 +139,34 @@ class PGMfunctions:
         NoMetaDataProvided
             If the path to the meta data is not provided.
         """
-        if 0 not in (
+        if self.path_active_power_profile is None:
+            raise NoActivePowerProfileProvided("No path to active power profile was provided")
+        if self.path_reactive_power_profile is None:
+            raise NoReactivePowerProfileProvided("No path to reactive power profile was provided")
+        if self.path_ev_active_power_profile is None:
+            raise NoEVPowerProfileProvided("No path to EV power profile was provided")
+        if self.path_meta_data is None:
+            raise NoMetaDataProvided("No path to meta data was provided")
+
+        validate_input_data(
+            self.path_input_network_data,
             self.path_active_power_profile,
             self.path_reactive_power_profile,
             self.path_ev_active_power_profile,
             self.path_meta_data,
-        ):
-            validate_input_data(
-                self.path_input_network_data,
-                self.path_active_power_profile,
-                self.path_reactive_power_profile,
-                self.path_ev_active_power_profile,
-                self.path_meta_data,
-                test_case=test_case,
-            )
-        else:
-            if self.path_active_power_profile == 0:
-                raise NoActivePowerProfileProvided("No path to active power profile was provided")
-            if self.path_reactive_power_profile == 0:
-                raise NoReactivePowerProfileProvided("No path to reactive power profile was provided")
-            if self.path_ev_active_power_profile == 0:
-                raise NoEVPowerProfileProvided("No path to EV power profile was provided")
-            if self.path_meta_data == 0:
-                raise NoMetaDataProvided("No path to meta data was provided")
-
-    def create_batch_update_data(self, path_active_power_profile=0, path_reactive_power_profile=0) -> None:
+            test_case=test_case,
+        )
+
+    def create_batch_update_data(self, path_active_power_profile=None, path_reactive_power_profile=None) -> None:
         """
         Creates batch update data using the provided active and reactive power profiles.
 
         Parameters
         ----------
         path_active_power_profile : str, optional
-            Path to the active power profile file (default is 0).
+            Path to the active power profile file (default is None).
         path_reactive_power_profile : str, optional
-            Path to the reactive power profile file (default is 0).
+            Path to the reactive power profile file (default is None).
 
         Raises
         ------
@@ -182,29 +175,27 @@ class PGMfunctions:
         NoReactivePowerProfileProvided
             If the path to the reactive power profile is not provided.
         """
-        if path_active_power_profile != 0:
-            pth_active = path_active_power_profile
-        elif self.path_active_power_profile != 0:
-            pth_active = self.path_active_power_profile
-        else:
+        pth_active = (
+            path_active_power_profile if path_active_power_profile is not None else self.path_active_power_profile
+        )
+        if pth_active is None:
             raise NoActivePowerProfileProvided("No path to active power profile was provided")
 
-        if path_reactive_power_profile != 0:
-            pth_reactive = path_reactive_power_profile
-        elif self.path_reactive_power_profile != 0:
-            pth_reactive = self.path_reactive_power_profile
-        else:
+        pth_reactive = (
+            path_reactive_power_profile if path_reactive_power_profile is not None else self.path_reactive_power_profile
+        )
+        if pth_reactive is None:
             raise NoReactivePowerProfileProvided("No path to reactive power profile was provided")
 
-        if 0 not in (pth_active, pth_reactive):
-            self.model.create_batch_update_data(pth_active, pth_reactive)
+        self.model.create_batch_update_data(pth_active, pth_reactive)
 
     def ev_penetration_level(
         self,
         penetration_level_percentage: int,
-        path_ev_power_profile=0,
-        path_meta_data=0,
+        path_ev_power_profile=None,
+        path_meta_data=None,
         assert_valid_pwr_profile=False,
+        threads=0,
     ):
         """
         Calculates the EV penetration level based on the provided data.
@@ -214,11 +205,13 @@ class PGMfunctions:
         penetration_level_percentage : int
             The penetration level percentage of EVs.
         path_ev_power_profile : str, optional
-            Path to the EV power profile file (default is 0).
+            Path to the EV power profile file (default is None).
         path_meta_data : str, optional
-            Path to the meta data file (default is 0).
+            Path to the meta data file (default is None).
         assert_valid_pwr_profile : bool, optional
             Flag to assert valid power profile (default is False).
+        threads : int, optional
+            Number of threads to use for the calculation (default is 0, all hardware threads).
 
         Returns
         -------
@@ -232,31 +225,25 @@ class PGMfunctions:
         NoReactivePowerProfileProvided
             If the path to the meta data is not provided.
         """
-        if path_ev_power_profile != 0:
-            pth_ev = path_ev_power_profile
-        elif self.path_ev_active_power_profile != 0:
-            pth_ev = self.path_ev_active_power_profile
-        else:
+        pth_ev = path_ev_power_profile if path_ev_power_profile is not None else self.path_ev_active_power_profile
+        if pth_ev is None:
             raise NoEVPowerProfileProvided("No path to EV power profile was provided")
 
-        if path_meta_data != 0:
-            pth_meta = path_meta_data
-        elif self.path_meta_data != 0:
-            pth_meta = self.path_meta_data
-        else:
+        pth_meta = path_meta_data if path_meta_data is not None else self.path_meta_data
+        if pth_meta is None:
             raise NoReactivePowerProfileProvided("No path to meta data was provided")
 
-        if 0 not in (pth_meta, pth_ev):
-            df_voltages, df_line_loading = ev_penetration_calculation(
-                self.model,
-                self.input_network_array_model,
-                self.path_input_network_data,
-                pth_ev,
-                pth_meta,
-                penetration_level_percentage,
-                assert_valid_pwr_profile=assert_valid_pwr_profile,
-            )
-            return df_voltages, df_line_loading
+        df_voltages, df_line_loading = ev_penetration_calculation(
+            self.model,
+            self.input_network_array_model,
+            self.model.input_data,
+            pth_ev,
+            pth_meta,
+            penetration_level_percentage,
+            assert_valid_pwr_profile=assert_valid_pwr_profile,
+            threads=threads,
+        )
+        return df_voltages, df_line_loading
 
     def n_1_calculation(self, line_id_disconnect: int, reset_model_once_done=False):
         """
@@ -278,8 +265,28 @@ class PGMfunctions:
             self.model, self.input_network_array_model, line_id_disconnect, reset_model_once_done=reset_model_once_done
         )
 
+    def n_1_calculation_batch(self, line_ids_disconnect, threads=0):
+        """
+        Performs N-1 calculations for several line disconnections in one batch calculation.
+
+        Parameters
+        ----------
+        line_ids_disconnect : list of int
+            The IDs of the lines to be disconnected, one at a time.
+        threads : int, optional
+            Number of threads to use for the calculation (default is 0, all hardware threads).
+
+        Returns
+        -------
+        table
+            Results of the N-1 calculations, indexed by disconnected and alternative line ID.
+        """
+        return n_1_calculation_batch_module(
+            self.model, self.input_network_array_model, line_ids_disconnect, threads=threads
+        )
+
     def find_optimal_tap_position(
-        self, optimization_mode=0, path_active_power_profile=0, path_reactive_power_profile=0, threads=0
+        self, optimization_mode=0, path_active_power_profile=None, path_reactive_power_profile=None, threads=0
     ):
         """
         Finds the optimal tap position based on the provided data and optimization mode.
@@ -289,11 +296,11 @@ class PGMfunctions:
         optimization_mode : int, optional
             The optimization mode (default is 0), 0 for minimum voltage deviation, 1 for minimum line loading.
         path_active_power_profile : str, optional
-            Path to the active power profile file (default is 0).
+            Path to the active power profile file (default is None).
         path_reactive_power_profile : str, optional
-            Path to the reactive power profile file (default is 0).
+            Path to the reactive power profile file (default is None).
         threads : int, optional
-            Number of threads to use for the calculation (default is 1).
+            Number of threads to use for the calculation (default is 0, all hardware threads).
 
         Returns
         -------
@@ -307,24 +314,19 @@ class PGMfunctions:
         NoReactivePowerProfileProvided
             If the path to the reactive power profile is not provided.
         """
-        if path_active_power_profile != 0:
-            pth_active = path_active_power_profile
-        elif self.path_active_power_profile != 0:
-            pth_active = self.path_active_power_profile
-        else:
+        pth_active = (
+            path_active_power_profile if path_active_power_profile is not None else self.path_active_power_profile
+        )
+        if pth_active is None:
             raise NoActivePowerProfileProvided("No path to active power profile was provided")
 
-        if path_reactive_power_profile != 0:
-            pth_reactive = path_reactive_power_profile
-        elif self.path_reactive_power_profile != 0:
-            pth_reactive = self.path_reactive_power_profile
-        else:
+        pth_reactive = (
+            path_reactive_power_profile if path_reactive_power_profile is not None else self.path_reactive_power_profile
+        )
+        if pth_reactive is None:
             raise NoReactivePowerProfileProvided("No path to reactive power profile was provided")
 
-        if 0 in (path_active_power_profile, path_reactive_power_profile):
+        if None in (path_active_power_profile, path_reactive_power_profile):
             self.create_batch_update_data(pth_active, pth_reactive)
 
-        if 0 not in (pth_active, pth_reactive):
-            return optimal_tap_pos(
-                self.model, self.path_input_network_data, mode=optimization_mode, number_threads=threads
-            )
+        return optimal_tap_pos(self.model, self.model.input_data, mode=optimization_mode, number_threads=threads)
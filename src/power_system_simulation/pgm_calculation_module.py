@@ -10,12 +10,26 @@ Returns:
     pd.dataFrame -> max/min node voltage for each moment in time
 """
 
+import copy
+import functools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import numpy as np
 import pandas as pd
-from power_grid_model import CalculationMethod, CalculationType, PowerGridModel, initialize_array
+from power_grid_model import (
+    CalculationInitialization,
+    CalculationMethod,
+    CalculationType,
+    PowerGridModel,
+    initialize_array,
+)
 from power_grid_model.utils import json_deserialize
 from power_grid_model.validation import assert_valid_batch_data, assert_valid_input_data
 
+from power_system_simulation.numba_kernels import NUMBA_AVAILABLE, line_reduction_kernel, row_argmax_argmin_kernel
+
 
 class ProfileTimestampsNotMatchingError(Exception):
     """Error raised when active and reactive load profiles do not have matching timestamps"""
@@ -36,20 +50,32 @@ class PGMcalculation:
         Initializes the pgm_calculation class.
     create_pgm(input_network_data: str)
         Creates a power grid model from the input network data.
-    create_batch_update_data(path_active_power_profile: str, path_reactive_power_profile: str)
+    create_batch_update_data(path_active_power_profile: str, path_reactive_power_profile: str, full_validation=False)
         Creates batch update data for the model using the provided power profiles.
-    update_model(model_update_data)
+    prepare(input_network_data: str, path_active_power_profile: str, path_reactive_power_profile: str, ...)
+        Creates the model and the batch update data, reading the profiles while the model is created.
+    clone()
+        Creates a copy of the calculation with its own model.
+    update_model(model_update_data, force_validate=False)
         Updates the model with new data.
-    run_power_flow_calculation(update_data_calc=0)
+    run_power_flow_calculation(update_data_calc=None, timestamps_given=None, threads=0, ...)
         Runs the power flow calculation using the model.
-    aggregate_voltages()
+    aggregate_voltages_arrays()
+        Aggregates the voltage data from the power flow calculation into arrays.
+    aggregate_voltages(categorical_nodes=False)
         Aggregates the voltage data from the power flow calculation.
+    aggregate_line_loading_arrays()
+        Aggregates the line loading data from the power flow calculation into arrays.
     aggregate_line_loading()
         Aggregates the line loading data from the power flow calculation.
+    run_scenarios(input_network_data, path_active_power_profile, path_reactive_power_profile, scenarios, n_procs=None)
+        Runs the time-series power flow for independent scenarios in parallel worker processes.
     """
 
     def __init__(self):
         """Initializes the pgm_calculation class with no parameters."""
+        # layouts of update data that already passed assert_valid_batch_data, see update_model
+        self._validated_keys = set()
 
     def create_pgm(self, input_network_data: str):
         """
@@ -60,17 +86,21 @@ class PGMcalculation:
         input_network_data : str
             Path to the JSON file containing the input network data.
         """
-        # Deserialize JSON file of network
-        with open(input_network_data, encoding="utf-8") as ind:
-            self.input_data = json_deserialize(ind.read())
+        # Deserialize and validate JSON file of network, unless it was loaded before and did not change since.
+        # The cached dataset is shared, so every calculation gets its own copy
+        stat = os.stat(input_network_data)
+        network_key = (os.path.abspath(input_network_data), stat.st_mtime_ns, stat.st_size)
+        self.input_data = copy.deepcopy(_load_network(*network_key))
 
-        # Validate input data, raises `ValidationException`
-        assert_valid_input_data(input_data=self.input_data, calculation_type=CalculationType.power_flow)
+        # Construct model, copying the model built before for the same file is cheaper than building it again
+        self.model = _build_model(*network_key).copy()
 
-        # Construct model
-        self.model = PowerGridModel(input_data=self.input_data)
+        # update data validated against a previous network is not valid for this one
+        self._validated_keys = set()
 
-    def create_batch_update_data(self, path_active_power_profile: str, path_reactive_power_profile: str):
+    def create_batch_update_data(
+        self, path_active_power_profile: str, path_reactive_power_profile: str, full_validation=False
+    ):
         """
         Creates batch update data for the model using the provided power profiles.
 
@@ -80,6 +110,8 @@ class PGMcalculation:
             Path to the parquet file containing the active power profile.
         path_reactive_power_profile : str
             Path to the parquet file containing the reactive power profile.
+        full_validation : bool, optional
+            Validate every timestamp of the batch update data instead of an evenly spaced sample (default is False).
 
         Raises
         ------
@@ -88,41 +120,131 @@ class PGMcalculation:
         ProfileTimestampsNotMatchingError
             If the timestamps of active and reactive power profiles do not match.
         """
-        active_power_profile = pd.read_parquet(path_active_power_profile)
-        reactive_power_profile = pd.read_parquet(path_reactive_power_profile)
+        # memory map the parquet files so pyarrow decodes straight from the page cache, pyarrow releases the GIL
+        # while decoding so both files are read at the same time
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            active_power_profile, reactive_power_profile = executor.map(
+                _read_profile, (path_active_power_profile, path_reactive_power_profile)
+            )
+        self._set_batch_update_data(active_power_profile, reactive_power_profile, full_validation)
+
+    def prepare(
+        self,
+        input_network_data: str,
+        path_active_power_profile: str,
+        path_reactive_power_profile: str,
+        full_validation=False,
+    ):
+        """
+        Creates the model and the batch update data, same as create_pgm followed by create_batch_update_data.
 
-        self.timestamps = active_power_profile.index
+        The power profiles are read while the network data is deserialized, validated and built into a model.
 
-        if (active_power_profile.columns != reactive_power_profile.columns).any():
+        Parameters
+        ----------
+        input_network_data : str
+            Path to the JSON file containing the input network data.
+        path_active_power_profile : str
+            Path to the parquet file containing the active power profile.
+        path_reactive_power_profile : str
+            Path to the parquet file containing the reactive power profile.
+        full_validation : bool, optional
+            Validate every timestamp of the batch update data instead of an evenly spaced sample (default is False).
+
+        Raises
+        ------
+        ValidationException
+            If the input data or the batch update data is invalid.
+        ProfileLoadIDsNotMatchingError
+            If the load IDs of active and reactive power profiles do not match.
+        ProfileTimestampsNotMatchingError
+            If the timestamps of active and reactive power profiles do not match.
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            profiles = executor.map(_read_profile, (path_active_power_profile, path_reactive_power_profile))
+            self.create_pgm(input_network_data)
+            active_power_profile, reactive_power_profile = profiles
+        self._set_batch_update_data(active_power_profile, reactive_power_profile, full_validation)
+
+    def _set_batch_update_data(self, active_power_profile, reactive_power_profile, full_validation):
+        """Checks the profiles against each other, then stores and validates them as batch update data"""
+        self._set_timestamps(active_power_profile.index)
+
+        # identical index objects (e.g. both profiles built on the same schema) need no element-wise comparison
+        active_ids, reactive_ids = active_power_profile.columns, reactive_power_profile.columns
+        if active_ids is not reactive_ids and not active_ids.equals(reactive_ids):
             raise ProfileLoadIDsNotMatchingError("Load IDs of active and reactive power do not match!")
-        if not active_power_profile.index.equals(reactive_power_profile.index):
+        active_timestamps, reactive_timestamps = active_power_profile.index, reactive_power_profile.index
+        if active_timestamps is not reactive_timestamps and not active_timestamps.equals(reactive_timestamps):
             raise ProfileTimestampsNotMatchingError("Timestamps of active and reactive power do not match!")
 
         batch_update_dataset = initialize_array("update", "sym_load", active_power_profile.shape)
         batch_update_dataset["id"] = active_power_profile.columns.to_numpy()
-        batch_update_dataset["p_specified"] = active_power_profile.to_numpy()
-        batch_update_dataset["q_specified"] = reactive_power_profile.to_numpy()
+        # to_numpy() is a view of a single-dtype profile and np.copyto casts while copying into the structured
+        # array, so every profile is copied exactly once
+        np.copyto(batch_update_dataset["p_specified"], active_power_profile.to_numpy(copy=False), casting="same_kind")
+        np.copyto(batch_update_dataset["q_specified"], reactive_power_profile.to_numpy(copy=False), casting="same_kind")
         self.update_data = {"sym_load": batch_update_dataset}
 
+        # every timestamp has the same load IDs and no status, so a sample of the timestamps finds the same errors
+        validation_data = self.update_data if full_validation else _sample_batch(self.update_data)
         assert_valid_batch_data(
-            input_data=self.input_data, update_data=self.update_data, calculation_type=CalculationType.power_flow
+            input_data=self.input_data, update_data=validation_data, calculation_type=CalculationType.power_flow
         )
+        # update_model does not need to validate this layout again
+        self._validated_keys.add(_update_data_key(self.update_data))
+
+    def clone(self):
+        """
+        Creates a copy of the calculation with its own model.
+
+        The model is copied with PowerGridModel.copy(), so the copy keeps all updates applied so far without
+        rebuilding the model from the input data. Updating the copy does not change this calculation.
+        Input data, batch update data and timestamps are shared, not copied.
+
+        Returns
+        -------
+        PGMcalculation
+            The copied calculation.
+        """
+        cloned = copy.copy(self)
+        cloned.model = self.model.copy()
+        cloned._validated_keys = set(self._validated_keys)  # pylint: disable=protected-access
+        return cloned
 
-    def update_model(self, model_update_data):
+    def update_model(self, model_update_data, force_validate=False):
         """
         Updates the model with new data.
 
+        Validation is skipped when update data with the same components, shapes, dtypes and IDs
+        was validated before against the current network, as in tap position sweeps and N-1 calculations.
+        The values of such updates are not validated again, force_validate=True validates them as well.
+        create_pgm clears the validated layouts.
+
         Parameters
         ----------
         model_update_data : dict
             The update data to be applied to the model.
+        force_validate : bool, optional
+            Validate the update data even if the same layout was validated before (default is False).
         """
-        assert_valid_batch_data(
-            input_data=self.input_data, update_data=model_update_data, calculation_type=CalculationType.power_flow
-        )
+        key = _update_data_key(model_update_data)
+        if force_validate or key not in self._validated_keys:
+            assert_valid_batch_data(
+                input_data=self.input_data, update_data=model_update_data, calculation_type=CalculationType.power_flow
+            )
+            self._validated_keys.add(key)
         self.model.update(update_data=model_update_data)
 
-    def run_power_flow_calculation(self, update_data_calc=0, timestamps_given=0, threads=0):
+    def run_power_flow_calculation(
+        self,
+        update_data_calc=None,
+        timestamps_given=None,
+        threads=0,
+        calculation_method=CalculationMethod.newton_raphson,
+        calculation_initialization=CalculationInitialization.default,
+        continue_on_batch_error=False,
+    ):
         """
         Runs the power flow calculation using the model.
 
@@ -130,54 +252,151 @@ class PGMcalculation:
         ----------
         update_data_calc : dict, optional
             The update data to be used for the calculation. If not provided, it defaults to self.update_data.
+        timestamps_given : pd.DatetimeIndex, optional
+            Timestamps belonging to update_data_calc. If not provided, the timestamps of self.update_data are kept.
+        threads : int, optional
+            Number of threads used by power-grid-model for the batch calculation (default is 0).
+            0 uses the number of hardware threads, a negative value runs the batch sequentially.
+        calculation_method : CalculationMethod, optional
+            Power flow method (default is CalculationMethod.newton_raphson).
+        calculation_initialization : CalculationInitialization, optional
+            Start of the Newton-Raphson iterations (default is CalculationInitialization.default, a linear
+            voltage guess). power-grid-model does not accept the voltages of a previous calculation as start.
+        continue_on_batch_error : bool, optional
+            If True, timestamps that fail (e.g. do not converge) do not stop the batch calculation (default is False).
+            Their results in output_data are left at zero, the failed timestamps are listed in
+            self.batch_error.failed_scenarios. self.batch_error is None when all timestamps succeeded.
+
+        Raises
+        ------
+        PowerGridBatchError
+            If any timestamp fails and continue_on_batch_error is False.
         """
-        if update_data_calc == 0:
+        if update_data_calc is None:
             update_data_calc = self.update_data
-        if not isinstance(timestamps_given, int):
-            self.timestamps = timestamps_given
+        if timestamps_given is not None:
+            self._set_timestamps(timestamps_given)
         self.output_data = self.model.calculate_power_flow(
-            update_data=update_data_calc, calculation_method=CalculationMethod.newton_raphson, threading=threads
+            update_data=update_data_calc,
+            calculation_method=calculation_method,
+            threading=threads,
+            calculation_initialization=calculation_initialization,
+            continue_on_batch_error=continue_on_batch_error,
         )
+        self.batch_error = self.model.batch_error
+
+    def _set_timestamps(self, timestamps):
+        """Stores the timestamps of the batch, also as datetime64[ns] array for indexing in the aggregations"""
+        self.timestamps = timestamps
+        self.timestamps_ns = np.asarray(timestamps, dtype="datetime64[ns]")
 
-    def aggregate_voltages(self):
+    def aggregate_voltages_arrays(self) -> dict[str, np.ndarray]:
         """
-        Aggregates the voltage data from the power flow calculation.
+        Aggregates the voltage data from the power flow calculation into arrays.
 
         Returns
         -------
-        pd.DataFrame
-            DataFrame containing timestamps, maximum voltages,
-            and minimum voltages along with their respective node IDs.
+        dict[str, np.ndarray]
+            Maximum voltages and minimum voltages along with their respective node IDs,
+            one value per timestamp and keyed by the column names of aggregate_voltages.
         """
         u_pu, node_id = (
             self.output_data["node"]["u_pu"],
             self.output_data["node"]["id"],
         )
 
-        # Find max and min voltages along with their node indices
-        u_pu_max = u_pu.max(axis=1)
-        u_pu_max_indices = np.argmax(u_pu, axis=1)
-        u_pu_min = u_pu.min(axis=1)
-        u_pu_min_indices = np.argmin(u_pu, axis=1)
-
-        # Use the indices to get the corresponding node IDs
-        u_pu_max_node_ids = np.take_along_axis(node_id, u_pu_max_indices[:, None], axis=1).flatten()
-        u_pu_min_node_ids = np.take_along_axis(node_id, u_pu_min_indices[:, None], axis=1).flatten()
-
-        # Construct the DataFrame
-        max_min_voltage_df = pd.DataFrame(
-            {
-                "Timestamp": self.timestamps,
-                "Max_Voltage": u_pu_max,
-                "Max_Voltage_Node": u_pu_max_node_ids,
-                "Min_Voltage": u_pu_min,
-                "Min_Voltage_Node": u_pu_min_node_ids,
-            }
-        )
+        # Find the node indices of the max and min voltages, then gather the values from them
+        if NUMBA_AVAILABLE:
+            u_pu_max_indices, u_pu_min_indices = row_argmax_argmin_kernel(u_pu)
+        else:
+            u_pu_max_indices = np.argmax(u_pu, axis=1)
+            u_pu_min_indices = np.argmin(u_pu, axis=1)
+        u_pu_max = np.take_along_axis(u_pu, u_pu_max_indices[:, None], axis=1).ravel()
+        u_pu_min = np.take_along_axis(u_pu, u_pu_min_indices[:, None], axis=1).ravel()
+
+        # Use the indices to get the corresponding node IDs, which are identical for every timestamp
+        u_pu_max_node_ids = node_id[0, u_pu_max_indices]
+        u_pu_min_node_ids = node_id[0, u_pu_min_indices]
+
+        return {
+            "Max_Voltage": u_pu_max,
+            "Max_Voltage_Node": u_pu_max_node_ids,
+            "Min_Voltage": u_pu_min,
+            "Min_Voltage_Node": u_pu_min_node_ids,
+        }
+
+    def aggregate_voltages(self, categorical_nodes=False):
+        """
+        Aggregates the voltage data from the power flow calculation.
+
+        Parameters
+        ----------
+        categorical_nodes : bool, optional
+            Store the node ID columns as pd.Categorical with all node IDs as categories (default is False).
+            This takes less memory for long time series, since there are far fewer nodes than timestamps.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame containing timestamps, maximum voltages,
+            and minimum voltages along with their respective node IDs.
+        """
+        voltages_arrays = self.aggregate_voltages_arrays()
+        if categorical_nodes:
+            node_ids = self.output_data["node"]["id"][0]
+            for column in ("Max_Voltage_Node", "Min_Voltage_Node"):
+                voltages_arrays[column] = pd.Categorical(voltages_arrays[column], categories=node_ids)
+
+        # the arrays are freshly computed, so the columns can use them without copying
+        return pd.DataFrame(voltages_arrays, index=pd.Index(self.timestamps, name="Timestamp"), copy=False)
 
-        max_min_voltage_df.set_index("Timestamp", inplace=True)
+    def aggregate_line_loading_arrays(self) -> dict[str, np.ndarray]:
+        """
+        Aggregates the line loading data from the power flow calculation into arrays.
 
-        return max_min_voltage_df
+        Returns
+        -------
+        dict[str, np.ndarray]
+            Line IDs, total losses, maximum loading, and minimum loading along with their respective timestamps,
+            one value per line and keyed by the index and column names of aggregate_line_loading.
+        """
+        line_loading = self.output_data["line"]["loading"]
+        line_id = self.output_data["line"]["id"]
+        p_from = self.output_data["line"]["p_from"]
+        p_to = self.output_data["line"]["p_to"]
+        timestamps = self.timestamps_ns
+
+        # Line IDs are identical for every timestamp, so each column of the output arrays is one line
+        line_ids = line_id[0]
+        line_columns = np.arange(line_ids.size)
+
+        # Calculate losses for each line over time, trapezoidal rule as a weighted sum over the timestamps,
+        # and the timestamps of the max and min loadings of every line
+        weights = _trapezoid_weights(timestamps)
+        if NUMBA_AVAILABLE:
+            max_loading_indices, min_loading_indices, e_losses_kwh = line_reduction_kernel(
+                line_loading, p_from, p_to, weights
+            )
+        else:
+            e_losses = np.abs(p_from + p_to)  # p_from and p_to are in Watts
+            e_losses_kwh = weights @ e_losses / 1000  # integrate over time in hours and convert to kWh
+            max_loading_indices = np.argmax(line_loading, axis=0)
+            min_loading_indices = np.argmin(line_loading, axis=0)
+
+        # Gather the max and min loadings of every line and their timestamps
+        max_loadings = line_loading[max_loading_indices, line_columns]
+        min_loadings = line_loading[min_loading_indices, line_columns]
+        max_loading_timestamps = timestamps[max_loading_indices]
+        min_loading_timestamps = timestamps[min_loading_indices]
+
+        return {
+            "Line_ID": line_ids,
+            "Total_Loss": e_losses_kwh,
+            "Max_Loading": max_loadings,
+            "Max_Loading_Timestamp": max_loading_timestamps,
+            "Min_Loading": min_loadings,
+            "Min_Loading_Timestamp": min_loading_timestamps,
+        }
 
     def aggregate_line_loading(self):
         """
@@ -189,47 +408,120 @@ class PGMcalculation:
             DataFrame containing line IDs, total losses, maximum loading,
             and minimum loading along with their respective timestamps.
         """
-        line_loading = self.output_data["line"]["loading"]
-        line_id = self.output_data["line"]["id"]
-        p_from = self.output_data["line"]["p_from"]
-        p_to = self.output_data["line"]["p_to"]
-        timestamps = self.timestamps
-
-        unique_line_ids = np.unique(line_id)
-
-        # Calculate losses for each line over time
-        e_losses = np.abs(p_from + p_to)  # p_from and p_to are in Watts
-        e_losses_kwh = np.trapz(e_losses, axis=0) / 1000  # integrate over time and convert to kWh
-
-        # Initialize arrays to store results
-        max_loadings = np.zeros_like(unique_line_ids, dtype=float)
-        max_loading_timestamps = np.zeros_like(unique_line_ids, dtype="datetime64[ns]")
-        min_loadings = np.zeros_like(unique_line_ids, dtype=float)
-        min_loading_timestamps = np.zeros_like(unique_line_ids, dtype="datetime64[ns]")
-
-        # Iterate over unique line IDs
-        for idx, line_id_i in enumerate(unique_line_ids):
-            line_mask = line_id == line_id_i
-            loads = line_loading[line_mask]
-
-            # Calculate max and min loadings and their timestamps
-            max_loadings[idx] = loads.max()
-            max_loading_timestamps[idx] = timestamps[np.argmax(loads)]
-            min_loadings[idx] = loads.min()
-            min_loading_timestamps[idx] = timestamps[np.argmin(loads)]
-
-        # Construct the DataFrame
-        max_min_line_loading_df = pd.DataFrame(
-            {
-                "Line_ID": unique_line_ids,
-                "Total_Loss": e_losses_kwh,
-                "Max_Loading": max_loadings,
-                "Max_Loading_Timestamp": max_loading_timestamps,
-                "Min_Loading": min_loadings,
-                "Min_Loading_Timestamp": min_loading_timestamps,
-            }
-        )
+        line_loading_arrays = self.aggregate_line_loading_arrays()
+        line_ids = line_loading_arrays.pop("Line_ID")
+        # the arrays are freshly computed, so the columns can use them without copying
+        return pd.DataFrame(line_loading_arrays, index=pd.Index(line_ids, name="Line_ID"), copy=False)
+
+    @classmethod
+    def run_scenarios(
+        cls, input_network_data, path_active_power_profile, path_reactive_power_profile, scenarios, n_procs=None
+    ):
+        """
+        Runs the time-series power flow for independent scenarios in parallel worker processes.
 
-        max_min_line_loading_df.set_index("Line_ID", inplace=True)
+        The inputs are loaded and validated once in the calling process, so invalid or missing inputs raise here.
+        Every worker then creates the model and the batch update data once, each scenario is calculated on a
+        clone of it, so scenarios do not affect each other. Within a worker the batch runs sequentially.
 
-        return max_min_line_loading_df
+        Parameters
+        ----------
+        input_network_data : str
+            Path to the JSON file containing the input network data.
+        path_active_power_profile : str
+            Path to the parquet file containing the active power profile.
+        path_reactive_power_profile : str
+            Path to the parquet file containing the reactive power profile.
+        scenarios : list of dict
+            Update data applied to the model for each scenario, e.g. line statuses or a tap position.
+        n_procs : int, optional
+            Number of worker processes (default is None, the number of CPUs).
+
+        Returns
+        -------
+        list of tuple[pd.DataFrame, pd.DataFrame]
+            Results of aggregate_voltages and aggregate_line_loading for every scenario, in order.
+        """
+        cls().prepare(input_network_data, path_active_power_profile, path_reactive_power_profile)
+
+        # workers are not forked from this process, which may already run threads (pyarrow, numba, the profile
+        # readers), a fork would copy their locks; a worker that still fails to start raises BrokenProcessPool
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        with ProcessPoolExecutor(
+            n_procs,
+            mp_context=multiprocessing.get_context(method),
+            initializer=_init_scenario_worker,
+            initargs=(cls, input_network_data, path_active_power_profile, path_reactive_power_profile),
+        ) as executor:
+            return list(executor.map(_run_scenario, scenarios))
+
+
+# calculation of a run_scenarios worker process, created once by _init_scenario_worker
+_SCENARIO_CALCULATION = None
+
+
+def _init_scenario_worker(cls, input_network_data, path_active_power_profile, path_reactive_power_profile):
+    """Create the model and batch update data of a run_scenarios worker process"""
+    global _SCENARIO_CALCULATION  # pylint: disable=global-statement
+    _SCENARIO_CALCULATION = cls()
+    _SCENARIO_CALCULATION.prepare(input_network_data, path_active_power_profile, path_reactive_power_profile)
+
+
+def _run_scenario(scenario_update_data):
+    """Calculate one scenario of run_scenarios on a clone of the worker's calculation"""
+    calculation = _SCENARIO_CALCULATION.clone()
+    calculation.update_model(scenario_update_data)
+    calculation.run_power_flow_calculation(threads=-1)
+    return calculation.aggregate_voltages(), calculation.aggregate_line_loading()
+
+
+@functools.lru_cache(maxsize=8)
+def _load_network(path_input_network_data: str, mtime_ns: int, size: int):  # pylint: disable=unused-argument
+    """
+    Deserialize and validate a network file. mtime_ns and size only key the cache, so a modified file is loaded
+    again. Raises `ValidationException` if the input data is invalid, failures are not cached.
+    """
+    with open(path_input_network_data, encoding="utf-8") as ind:
+        input_data = json_deserialize(ind.read())
+    assert_valid_input_data(input_data=input_data, calculation_type=CalculationType.power_flow)
+    return input_data
+
+
+@functools.lru_cache(maxsize=8)
+def _build_model(path_input_network_data: str, mtime_ns: int, size: int) -> PowerGridModel:
+    """
+    Construct the model of a network file, keyed like _load_network. The cached model is never updated,
+    callers work on a copy.
+    """
+    return PowerGridModel(input_data=_load_network(path_input_network_data, mtime_ns, size))
+
+
+def _read_profile(path_profile: str) -> pd.DataFrame:
+    """Read a load profile from parquet with pyarrow, decoding the columns in parallel"""
+    return pd.read_parquet(path_profile, engine="pyarrow", memory_map=True, use_threads=True)
+
+
+def _sample_batch(update_data, sample_size=32):
+    """Evenly spaced sample of about sample_size scenarios of batch update data, for validation"""
+    return {component: array[:: max(1, array.shape[0] // sample_size)] for component, array in update_data.items()}
+
+
+def _update_data_key(update_data) -> tuple:
+    """Fingerprint of the layout of update data: component names, shapes, dtypes and IDs"""
+    return tuple(
+        (component, array.shape, array.dtype.str, hash(array["id"].tobytes()))
+        for component, array in sorted(update_data.items())
+    )
+
+
+def _trapezoid_weights(timestamps) -> np.ndarray:
+    """
+    Weights in hours that integrate a time series with the trapezoidal rule: half of the time step before and
+    half of the time step after every timestamp. A single timestamp has weight zero.
+    """
+    time_ns = np.asarray(timestamps, dtype="datetime64[ns]").view(np.int64)
+    weights = np.zeros(time_ns.size)
+    dt_hours = np.diff(time_ns) / 3.6e12
+    weights[:-1] += dt_hours / 2
+    weights[1:] += dt_hours / 2
+    return weights
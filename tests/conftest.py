@@ -0,0 +1,24 @@
+import json
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from power_grid_model.utils import json_deserialize
+
+PTH_SMALL_NETWORK_INPUT = "tests/data/small_network/input/"
+
+
+@pytest.fixture(scope="session")
+def parsed_inputs():
+    """Input data of the small network, deserialized once per test session. Tests must not modify it."""
+    with open(PTH_SMALL_NETWORK_INPUT + "input_network_data.json", encoding="utf-8") as ind:
+        net = json_deserialize(ind.read())
+    with open(PTH_SMALL_NETWORK_INPUT + "meta_data.json", encoding="utf-8") as metadata:
+        meta = json.load(metadata)
+    return SimpleNamespace(
+        net=net,
+        active=pd.read_parquet(PTH_SMALL_NETWORK_INPUT + "active_power_profile.parquet"),
+        reactive=pd.read_parquet(PTH_SMALL_NETWORK_INPUT + "reactive_power_profile.parquet"),
+        ev=pd.read_parquet(PTH_SMALL_NETWORK_INPUT + "ev_active_power_profile.parquet"),
+        meta=meta,
+    )
@@ -0,0 +1,36 @@
+import numpy as np
+
+from power_system_simulation.numba_kernels import (
+    line_reduction_kernel,
+    row_argmax_argmin_kernel,
+    voltage_deviation_kernel,
+)
+
+
+def test_voltage_deviation_kernel():
+    rng = np.random.default_rng(0)
+    u_pu = rng.uniform(0.9, 1.1, size=(24, 5))
+    expected = ((u_pu.max(axis=1) + u_pu.min(axis=1)) / 2 - 1).mean()
+    assert np.isclose(voltage_deviation_kernel(u_pu), expected)
+    assert np.isclose(voltage_deviation_kernel(u_pu.astype(np.float32)), expected, atol=1e-6)
+
+
+def test_line_reduction_kernel():
+    rng = np.random.default_rng(0)
+    loading = rng.integers(0, 4, size=(24, 5)).astype(np.float64)  # many ties, the first index must win
+    p_from = rng.uniform(-1e5, 1e5, size=(24, 5))
+    p_to = -p_from + rng.uniform(0, 1e3, size=(24, 5))
+    weights = np.full(24, 0.25)
+    weights[[0, -1]] = 0.125
+    max_indices, min_indices, losses = line_reduction_kernel(loading, p_from, p_to, weights)
+    assert np.array_equal(max_indices, np.argmax(loading, axis=0))
+    assert np.array_equal(min_indices, np.argmin(loading, axis=0))
+    assert np.allclose(losses, np.trapezoid(np.abs(p_from + p_to), dx=0.25, axis=0) / 1000)
+
+
+def test_row_argmax_argmin_kernel():
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 4, size=(24, 5)).astype(np.float64)  # many ties, the first index must win
+    max_indices, min_indices = row_argmax_argmin_kernel(values)
+    assert np.array_equal(max_indices, np.argmax(values, axis=1))
+    assert np.array_equal(min_indices, np.argmin(values, axis=1))
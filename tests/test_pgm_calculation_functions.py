@@ -1,12 +1,34 @@
+import os
+from pathlib import Path
+
+import numpy as np
 import pytest
 from power_grid_model.validation import ValidationException
 
-from power_system_simulation.graph_processing import *
-from power_system_simulation.input_data_validity_check import *
-from power_system_simulation.n_1_calculation import *
-from power_system_simulation.optimal_tap_position import *
+from power_system_simulation.ev_penetration_level import ev_penetration_calculation
+from power_system_simulation.graph_processing import (
+    EdgeAlreadyDisabledError,
+    GraphCycleError,
+    GraphNotFullyConnectedError,
+)
+from power_system_simulation.input_data_validity_check import (
+    _VALIDATION_CACHE,
+    InsufficientEVchargingProfilesError,
+    InvalidFeederIDError,
+    LoadProfileIDsNotSymLoadError,
+    LVfeederNotMatchTransformOutError,
+    MultipleSourcesError,
+    MultipleTransformersError,
+    _validation_cache_key,
+    validate_input_data,
+)
+from power_system_simulation.n_1_calculation import InvalidLineIDError
+from power_system_simulation.optimal_tap_position import InvalidMode, optimal_tap_pos
 from power_system_simulation.pgm_calculation_functions import PGMfunctions
-from power_system_simulation.pgm_calculation_module import *
+from power_system_simulation.pgm_calculation_module import (
+    ProfileLoadIDsNotMatchingError,
+    ProfileTimestampsNotMatchingError,
+)
 
 PTH_INPUT_NETWORK_DATA = "tests/data/small_network/input/input_network_data.json"
 PTH_ACTIVE_PROFILE = "tests/data/small_network/input/active_power_profile.parquet"
@@ -14,147 +36,201 @@ PTH_REACTIVE_PROFILE = "tests/data/small_network/input/reactive_power_profile.pa
 PTH_EV_ACTIVE_POWER_PROFILE = "tests/data/small_network/input/ev_active_power_profile.parquet"
 PTH_META_DATA = "tests/data/small_network/input/meta_data.json"
 
-PGM_MODEL = PGMfunctions(
-    PTH_INPUT_NETWORK_DATA, PTH_ACTIVE_PROFILE, PTH_REACTIVE_PROFILE, PTH_EV_ACTIVE_POWER_PROFILE, PTH_META_DATA
+
+@pytest.fixture(scope="session")
+def pgm_model():
+    model = PGMfunctions(
+        PTH_INPUT_NETWORK_DATA, PTH_ACTIVE_PROFILE, PTH_REACTIVE_PROFILE, PTH_EV_ACTIVE_POWER_PROFILE, PTH_META_DATA
+    )
+    model.create_pgm_model()
+    model.create_batch_update_data()
+    return model
+
+
+# test input validity check, expected error of each test case of change_data_for_test
+ERRORS = (
+    ValidationException,
+    MultipleTransformersError,
+    MultipleSourcesError,
+    InvalidFeederIDError,
+    LVfeederNotMatchTransformOutError,
+    GraphNotFullyConnectedError,
+    GraphCycleError,
+    ProfileTimestampsNotMatchingError,
+    ProfileTimestampsNotMatchingError,
+    ProfileLoadIDsNotMatchingError,
+    LoadProfileIDsNotSymLoadError,
+    InsufficientEVchargingProfilesError,
 )
-PGM_MODEL.create_pgm_model()
-PGM_MODEL.create_batch_update_data()
-
-
-# test input validity check
-def test_input_validity_check_function():
-    Errors = [
-        ValidationException,
-        MultipleTransformersError,
-        MultipleSourcesError,
-        InvalidFeederIDError,
-        LVfeederNotMatchTransformOutError,
-        GraphNotFullyConnectedError,
-        GraphCycleError,
-        ProfileTimestampsNotMatchingError,
-        ProfileTimestampsNotMatchingError,
-        ProfileLoadIDsNotMatchingError,
-        LoadProfileIDsNotSymLoadError,
-        InsufficientEVchargingProfilesError,
+
+
+def test_input_validity_check_function(pgm_model):
+    pgm_model.input_data_validity_check()
+    with pytest.raises(ERRORS[0]):
+        pgm_model.input_data_validity_check(test_case=1)
+
+
+@pytest.mark.parametrize("test_case,error", list(enumerate(ERRORS, start=1)))
+def test_input_validity_check_cases(parsed_inputs, test_case, error):
+    with pytest.raises(error):
+        validate_input_data(
+            parsed_inputs.net,
+            parsed_inputs.active,
+            parsed_inputs.reactive,
+            parsed_inputs.ev,
+            parsed_inputs.meta,
+            test_case=test_case,
+        )
+
+
+def test_input_validity_check_loaded_data_unchanged(parsed_inputs):
+    line = parsed_inputs.net["line"].copy()
+    with pytest.raises(GraphCycleError):
+        validate_input_data(
+            parsed_inputs.net,
+            parsed_inputs.active,
+            parsed_inputs.reactive,
+            parsed_inputs.ev,
+            parsed_inputs.meta,
+            test_case=7,
+        )
+    assert np.array_equal(parsed_inputs.net["line"]["to_status"], line["to_status"])
+    validate_input_data(parsed_inputs.net, path_meta_data=parsed_inputs.meta)
+
+
+def test_input_validity_check_path_objects():
+    paths = [
+        Path(pth)
+        for pth in (
+            PTH_INPUT_NETWORK_DATA,
+            PTH_ACTIVE_PROFILE,
+            PTH_REACTIVE_PROFILE,
+            PTH_EV_ACTIVE_POWER_PROFILE,
+            PTH_META_DATA,
+        )
     ]
-    for i in range(1, 13):
-        with pytest.raises(Errors[i - 1]):
-            PGM_MODEL.input_data_validity_check(test_case=i)
+    validate_input_data(*paths)
+    # Path and str inputs share the cached result
+    assert _validation_cache_key(*paths) == _validation_cache_key(*map(str, paths))
+    assert _validation_cache_key(*paths) in _VALIDATION_CACHE
+    with pytest.raises(GraphCycleError):
+        validate_input_data(*paths, test_case=7)
+
+
+def test_input_validity_check_cached(tmp_path):
+    pth_input_network_data = tmp_path / "input_network_data.json"
+    pth_input_network_data.write_bytes(open(PTH_INPUT_NETWORK_DATA, "rb").read())
+    pth_input_network_data = str(pth_input_network_data)
+
+    validate_input_data(pth_input_network_data, path_meta_data=PTH_META_DATA)
+    cache_key = _validation_cache_key(pth_input_network_data, None, None, None, PTH_META_DATA)
+    assert cache_key in _VALIDATION_CACHE
+
+    # a modified file is validated again under a new key
+    os.utime(pth_input_network_data, ns=(0, 0))
+    assert _validation_cache_key(pth_input_network_data, None, None, None, PTH_META_DATA) != cache_key
+    validate_input_data(pth_input_network_data, path_meta_data=PTH_META_DATA)
+    assert _validation_cache_key(pth_input_network_data, None, None, None, PTH_META_DATA) in _VALIDATION_CACHE
 
 
 # test ev penetration level
-def test_ev_penetration_level():
-    voltages, loading = PGM_MODEL.ev_penetration_level(50, assert_valid_pwr_profile=True)
+def assert_ev_result_layout(voltages, loading):
+    # results stay in float64 as computed by power-grid-model, IDs in the int32 of power-grid-model IDs
     assert voltages.shape == (960, 4)
     assert loading.shape == (9, 5)
+    assert voltages.dtypes.to_dict() == {
+        "Max_Voltage": np.float64,
+        "Max_Voltage_Node": np.int32,
+        "Min_Voltage": np.float64,
+        "Min_Voltage_Node": np.int32,
+    }
+    assert loading.dtypes.to_dict() == {
+        "Total_Loss": np.float64,
+        "Max_Loading": np.float64,
+        "Max_Loading_Timestamp": np.dtype("datetime64[ns]"),
+        "Min_Loading": np.float64,
+        "Min_Loading_Timestamp": np.dtype("datetime64[ns]"),
+    }
+    assert loading.index.dtype == np.int32
+
+
+def test_ev_penetration_level(pgm_model):
+    voltages, loading = pgm_model.ev_penetration_level(50, assert_valid_pwr_profile=True)
+    assert_ev_result_layout(voltages, loading)
+
+
+@pytest.mark.parametrize("path_type", [str, Path])
+def test_ev_penetration_calculation_from_path(pgm_model, path_type):
+    voltages, loading = ev_penetration_calculation(
+        pgm_model.model,
+        pgm_model.input_network_array_model,
+        path_type(PTH_INPUT_NETWORK_DATA),
+        PTH_EV_ACTIVE_POWER_PROFILE,
+        PTH_META_DATA,
+        50,
+    )
+    assert_ev_result_layout(voltages, loading)
 
 
 # test running a single powerflow calculation
-def test_run_single_powerflow_calculation():
-    PGM_MODEL.run_single_powerflow_calculation()
+def test_run_single_powerflow_calculation(pgm_model):
+    pgm_model.run_single_powerflow_calculation()
 
 
 # test n-1:
-def test_n_1_calculation():
-    PGM_MODEL.n_1_calculation(18, True)
+def test_n_1_calculation(pgm_model):
+    pgm_model.n_1_calculation(18, True)
 
 
-def test_n_1_invalid_line_id():
+def test_n_1_invalid_line_id(pgm_model):
     with pytest.raises(InvalidLineIDError):
-        PGM_MODEL.n_1_calculation(-1, True)
+        pgm_model.n_1_calculation(-1, True)
 
 
-def test_n_1_already_disconnected():
+def test_n_1_already_disconnected(pgm_model):
     with pytest.raises(EdgeAlreadyDisabledError):
-        PGM_MODEL.n_1_calculation(24, True)
+        pgm_model.n_1_calculation(24, True)
+
+
+def test_n_1_calculation_batch(pgm_model):
+    table = pgm_model.n_1_calculation_batch([18, 16])
+    single = pgm_model.n_1_calculation(16, True)
+    assert table.shape == (2, 3)
+    assert table.loc[16].equals(single)
+
+
+def test_n_1_calculation_batch_invalid_line_id(pgm_model):
+    with pytest.raises(InvalidLineIDError):
+        pgm_model.n_1_calculation_batch([18, -1])
+
+
+def test_n_1_calculation_batch_no_alternatives(pgm_model):
+    assert pgm_model.n_1_calculation_batch([]).empty
 
 
 # test optimal tap position:
-def test_optimal_tap_position_mode_0():
-    pos = PGM_MODEL.find_optimal_tap_position(optimization_mode=0)
-    assert pos == 1
+@pytest.mark.parametrize("mode,expected", [(0, 1), (1, 5)])
+def test_optimal_tap_position(pgm_model, mode, expected):
+    assert pgm_model.find_optimal_tap_position(optimization_mode=mode) == expected
+
+
+def test_optimal_tap_position_restores_tap(pgm_model):
+    pgm_model.create_batch_update_data()
+    pgm_model.model.run_power_flow_calculation()
+    u_pu = pgm_model.model.output_data["node"]["u_pu"].copy()
 
+    pgm_model.find_optimal_tap_position(optimization_mode=1)
+    pgm_model.model.run_power_flow_calculation()
+    assert np.array_equal(pgm_model.model.output_data["node"]["u_pu"], u_pu)
 
-def test_optimal_tap_position_mode_1():
-    pos = PGM_MODEL.find_optimal_tap_position(optimization_mode=1)
-    assert pos == 5
 
+@pytest.mark.parametrize("path_type", [str, Path])
+def test_optimal_tap_position_from_path(pgm_model, path_type):
+    # other tests may leave a different batch on the shared model, restore the load profiles first
+    pgm_model.create_batch_update_data()
+    assert optimal_tap_pos(pgm_model.model, path_type(PTH_INPUT_NETWORK_DATA), mode=1) == 5
 
-def test_invalid_mode():
+
+def test_invalid_mode(pgm_model):
     with pytest.raises(InvalidMode):
-        PGM_MODEL.find_optimal_tap_position(optimization_mode=2)
-
-
-# changing data for datasets:
-def change_data_for_test(
-    input_network, active_power_profile, reactive_power_profile, ev_power_profile, meta_data, test_case
-):
-    """Function to change data to perform test cases:
-    0: No test case
-    1: LV grid is not valied PGM input data
-    2: LV grid has more than one transformer
-    3: LV grid has more than one source
-    4: IDs in LV feeder IDs are not valid line IDs
-    5: Lines in LV feeder IDs do not have the same from_node as the to_node of the transformer
-    6: The grid is not fully connected in intial state
-    7: The grid is cyclic in intial state
-    8: Timestamps between active and reactive profile do not match
-    9: Timestamps between active and EV profile do not match
-    10: IDs in active and reactive profile do not match
-    11: IDs in active load (and reactive) load profile are valid sym_load IDs
-    12: the number of EV charging profile is not the same as or higher than the number of sym_load
-    """
-    all_ids = []
-    for i in input_network:
-        for n in input_network[i]:
-            all_ids.append(n[0])
-    max_id = max(all_ids)
-    all_node_ids = [i[0] for i in input_network["node"]]
-
-    if test_case == 1:
-        input_network["node"][0][0] = input_network["node"][1][0]
-    if test_case == 2:
-        input_network["transformer"] = np.append(input_network["transformer"], input_network["transformer"][0])
-        input_network["transformer"][1][0] = max_id + 1
-    if test_case == 3:
-        input_network["source"] = np.append(input_network["source"], input_network["source"][0])
-        input_network["source"][1][0] = max_id + 1
-    if test_case == 4:
-        meta_data["lv_feeders"][0] = max_id + 1
-    if test_case == 5:
-        to_node_transformer_false = input_network["transformer"][0][2] + 1
-        for i in input_network["line"]:
-            if i[0] == meta_data["lv_feeders"][0]:
-                if to_node_transformer_false == i[2]:
-                    to_node_transformer_false = to_node_transformer_false + 1
-                i[1] = to_node_transformer_false
-                break
-    if test_case == 6:
-        for i in meta_data["lv_feeders"]:
-            for n in input_network["line"]:
-                if n[0] == i:
-                    n[4] = 0
-    if test_case == 7:
-        for i in input_network["line"]:
-            i[3] = 1
-            i[4] = 1
-    if test_case == 8:
-        reactive_power_profile.rename(
-            index={pd.Timestamp(reactive_power_profile.index[0]): pd.Timestamp("2000-01-01 00:00:00")}, inplace=True
-        )
-    if test_case == 9:
-        ev_power_profile.rename(
-            index={pd.Timestamp(ev_power_profile.index[0]): pd.Timestamp("2000-01-01 00:00:00")}, inplace=True
-        )
-    if test_case == 10:
-        act_columns = active_power_profile.columns
-        active_power_profile = active_power_profile.rename(columns={act_columns[0]: (max(act_columns) + 1)})
-    if test_case == 11:
-        sym_load_id_wrong = max_id + 1
-        act_columns = active_power_profile.columns
-        active_power_profile = active_power_profile.rename(columns={act_columns[0]: sym_load_id_wrong})
-        reactive_power_profile = reactive_power_profile.rename(columns={act_columns[0]: sym_load_id_wrong})
-    if test_case == 12:
-        ev_power_profile = ev_power_profile.drop(ev_power_profile.columns[-1], axis=1)
-
-    return input_network, active_power_profile, reactive_power_profile, ev_power_profile, meta_data
+        pgm_model.find_optimal_tap_position(optimization_mode=2)
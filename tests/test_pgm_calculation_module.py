@@ -1,17 +1,29 @@
 import json
 import os
 
+import numpy as np
 import pandas as pd
 import pytest
-from power_grid_model import initialize_array
+from power_grid_model import CalculationInitialization, CalculationMethod, initialize_array
+from power_grid_model.errors import PowerGridBatchError
 from power_grid_model.validation import ValidationException
 
 from power_system_simulation.pgm_calculation_module import (
     PGMcalculation,
     ProfileLoadIDsNotMatchingError,
     ProfileTimestampsNotMatchingError,
+    _build_model,
+    _init_scenario_worker,
+    _load_network,
+    _run_scenario,
+    _sample_batch,
+    _trapezoid_weights,
+    _update_data_key,
 )
 
+# the tests write files to the same incorrect input data folder, keep them on one pytest-xdist worker
+pytestmark = pytest.mark.xdist_group(name="pgm_calculation_module")
+
 # test data
 input_network_data = "tests/data/input/input_network_data.json"
 path_active_profile = "tests/data/input/active_power_profile.parquet"
@@ -20,19 +32,27 @@ path_reactive_profile = "tests/data/input/reactive_power_profile.parquet"
 path_output_table_row_per_line = "tests/data/expected_output/output_table_row_per_line.parquet"
 path_output_table_row_per_timestamp = "tests/data/expected_output/output_table_row_per_timestamp.parquet"
 
-output_table_row_per_line = pd.read_parquet(path_output_table_row_per_line)
-output_table_row_per_timestamp = pd.read_parquet(path_output_table_row_per_timestamp)
-
-# make folder location for incorrect data (if it does not exist yet):
+# folder location for incorrect data
 incorrect_folder_path = "tests/data/incorrect_input_data"
-if not os.path.exists(incorrect_folder_path):
-    os.makedirs(incorrect_folder_path)
 
-model_pgm = PGMcalculation()
 
+@pytest.fixture
+def model_pgm():
+    model = PGMcalculation()
+    model.create_pgm(input_network_data)
+    return model
+
+
+@pytest.fixture
+def incorrect_folder():
+    os.makedirs(incorrect_folder_path, exist_ok=True)
+    return incorrect_folder_path
+
+
+def test_pgm_calculation(model_pgm):
+    output_table_row_per_line = pd.read_parquet(path_output_table_row_per_line)
+    output_table_row_per_timestamp = pd.read_parquet(path_output_table_row_per_timestamp)
 
-def test_pgm_calculation():
-    model_pgm.create_pgm(input_network_data)
     model_pgm.create_batch_update_data(path_active_profile, path_reactive_profile)
     model_pgm.run_power_flow_calculation()
     max_min_voltages = model_pgm.aggregate_voltages()
@@ -43,12 +63,12 @@ def test_pgm_calculation():
     )  # round since 14th number after comma is different
 
 
-def test_invalid_input_data():
+def test_invalid_input_data(model_pgm, incorrect_folder):
     # create invalid input data and save as "incorrect_input_network_data.json"
     with open(input_network_data) as ind:
         input_data_new = json.load(ind)
     input_data_new["data"]["node"][0]["id"] = 2  # node id=1 changed to node id=2
-    path_incorrect_input_network_data = "tests/data/incorrect_input_data/incorrect_input_network_data.json"
+    path_incorrect_input_network_data = incorrect_folder + "/incorrect_input_network_data.json"
     with open(path_incorrect_input_network_data, "w") as json_file:
         json.dump(input_data_new, json_file, indent=4)
 
@@ -57,32 +77,32 @@ def test_invalid_input_data():
         model_pgm.create_pgm(path_incorrect_input_network_data)
 
 
-def test_invalid_batch_dataset():
+def test_invalid_batch_dataset(model_pgm, incorrect_folder):
     # create invalid batch dataset
     incorrect_active_power_profile = pd.read_parquet(path_active_profile)
     incorrect_reactive_power_profile = pd.read_parquet(path_reactive_profile)
     incorrect_active_power_profile = incorrect_active_power_profile.rename(columns={8: 222})
     incorrect_reactive_power_profile = incorrect_active_power_profile.rename(columns={8: 222})
 
-    path_incorrect_active_profile = (
-        "tests/data/incorrect_input_data/incorrect_batch_dataset_active_power_profile.parquet"
-    )
-    path_incorrect_reactive_profile = (
-        "tests/data/incorrect_input_data/incorrect_batch_dataset_reactive_power_profile.parquet"
-    )
+    path_incorrect_active_profile = incorrect_folder + "/incorrect_batch_dataset_active_power_profile.parquet"
+    path_incorrect_reactive_profile = incorrect_folder + "/incorrect_batch_dataset_reactive_power_profile.parquet"
     incorrect_active_power_profile.to_parquet(path_incorrect_active_profile, engine="pyarrow", compression="snappy")
     incorrect_reactive_power_profile.to_parquet(path_incorrect_reactive_profile, engine="pyarrow", compression="snappy")
 
     # test wrong batch update (batch update sym_load id not in input network)
     with pytest.raises(ValidationException):
         model_pgm.create_batch_update_data(path_incorrect_active_profile, path_incorrect_reactive_profile)
+    with pytest.raises(ValidationException):
+        model_pgm.create_batch_update_data(
+            path_incorrect_active_profile, path_incorrect_reactive_profile, full_validation=True
+        )
 
 
-def test_load_ids_not_matching_error():
+def test_load_ids_not_matching_error(model_pgm, incorrect_folder):
     # create incorrect load ID in active power profile and output new parquet file
     incorrect_active_power_profile = pd.read_parquet(path_active_profile)
     incorrect_active_power_profile = incorrect_active_power_profile.rename(columns={8: 222})
-    path_incorrect_active_profile = "tests/data/incorrect_input_data/incorrect_loadIDs_active_power_profile.parquet"
+    path_incorrect_active_profile = incorrect_folder + "/incorrect_loadIDs_active_power_profile.parquet"
     incorrect_active_power_profile.to_parquet(path_incorrect_active_profile, engine="pyarrow", compression="snappy")
 
     # test incorrect active profile
@@ -90,13 +110,13 @@ def test_load_ids_not_matching_error():
         model_pgm.create_batch_update_data(path_incorrect_active_profile, path_reactive_profile)
 
 
-def test_time_stamp_ids_not_matching_error():
+def test_time_stamp_ids_not_matching_error(model_pgm, incorrect_folder):
     # create incorrect timestamp in active power profile and output new parquet file
     incorrect_active_power_profile = pd.read_parquet(path_active_profile)
     incorrect_active_power_profile.rename(
         index={pd.Timestamp("2024-01-01 00:00:00"): pd.Timestamp("2000-01-01 00:00:00")}, inplace=True
     )
-    path_incorrect_active_profile = "tests/data/incorrect_input_data/incorrect_timestamps_active_power_profile.parquet"
+    path_incorrect_active_profile = incorrect_folder + "/incorrect_timestamps_active_power_profile.parquet"
     incorrect_active_power_profile.to_parquet(path_incorrect_active_profile, engine="pyarrow", compression="snappy")
 
     # test incorrect active profile
@@ -116,3 +136,207 @@ def test_update_model():
     update_tap_data = {"line": update_line}
 
     model_pgm.update_model(update_tap_data)
+
+
+def test_update_model_force_validate():
+    model_pgm = PGMcalculation()
+    model_pgm.create_pgm(input_network_data)
+
+    update_line = initialize_array("update", "line", 1)
+    update_line["id"] = model_pgm.input_data["line"][0]["id"]
+    update_line["to_status"] = [0]
+    model_pgm.update_model({"line": update_line})
+
+    # force_validate checks the values even though this layout was validated before
+    update_line["to_status"] = [5]
+    with pytest.raises(ValidationException):
+        model_pgm.update_model({"line": update_line}, force_validate=True)
+
+
+def test_update_model_validates_after_new_network():
+    model_pgm = PGMcalculation()
+    model_pgm.create_pgm(input_network_data)
+    update_line = initialize_array("update", "line", 1)
+    update_line["id"] = 5
+    update_line["to_status"] = [0]
+    model_pgm.update_model({"line": update_line})
+
+    # line 5 does not exist in the small network, the layout validated before must be validated again
+    model_pgm.create_pgm("tests/data/small_network/input/input_network_data.json")
+    with pytest.raises(ValidationException):
+        model_pgm.update_model({"line": update_line})
+
+
+def test_clone():
+    model_pgm = PGMcalculation()
+    model_pgm.create_pgm(input_network_data)
+    model_pgm.create_batch_update_data(path_active_profile, path_reactive_profile)
+    model_pgm.run_power_flow_calculation()
+    line_loading = model_pgm.aggregate_line_loading()
+
+    cloned = model_pgm.clone()
+    update_line = initialize_array("update", "line", 1)
+    update_line["id"] = model_pgm.input_data["line"][0]["id"]
+    update_line["to_status"] = [0]
+    cloned.update_model({"line": update_line})
+    cloned.run_power_flow_calculation()
+
+    # the original model is not affected by updates of the clone
+    assert not cloned.aggregate_line_loading().equals(line_loading)
+    model_pgm.run_power_flow_calculation()
+    assert model_pgm.aggregate_line_loading().equals(line_loading)
+
+
+def test_run_power_flow_calculation_options():
+    model_pgm = PGMcalculation()
+    model_pgm.create_pgm(input_network_data)
+    model_pgm.create_batch_update_data(path_active_profile, path_reactive_profile)
+    model_pgm.run_power_flow_calculation()
+    u_pu = model_pgm.output_data["node"]["u_pu"]
+
+    model_pgm.run_power_flow_calculation(calculation_initialization=CalculationInitialization.flat)
+    assert np.allclose(model_pgm.output_data["node"]["u_pu"], u_pu)
+
+    model_pgm.run_power_flow_calculation(calculation_method=CalculationMethod.iterative_current)
+    assert np.allclose(model_pgm.output_data["node"]["u_pu"], u_pu, atol=1e-6)
+
+
+def test_trapezoid_weights():
+    timestamps = pd.to_datetime(["2024-01-01 00:00", "2024-01-01 00:15", "2024-01-01 00:30", "2024-01-01 01:30"])
+    assert np.allclose(_trapezoid_weights(timestamps), [0.125, 0.25, 0.625, 0.5])
+    assert np.array_equal(_trapezoid_weights(timestamps[:1]), [0.0])
+
+
+def test_run_power_flow_calculation_continue_on_batch_error():
+    model_pgm = PGMcalculation()
+    model_pgm.create_pgm(input_network_data)
+    model_pgm.create_batch_update_data(path_active_profile, path_reactive_profile)
+    model_pgm.run_power_flow_calculation()
+    assert model_pgm.batch_error is None
+
+    # a huge load in one timestamp does not converge
+    update_data = {"sym_load": model_pgm.update_data["sym_load"].copy()}
+    update_data["sym_load"]["p_specified"][2] = 1e12
+    with pytest.raises(PowerGridBatchError):
+        model_pgm.run_power_flow_calculation(update_data)
+    model_pgm.run_power_flow_calculation(update_data, continue_on_batch_error=True)
+    assert model_pgm.batch_error.failed_scenarios.tolist() == [2]
+
+
+def test_create_batch_update_data_registers_validation():
+    model_pgm = PGMcalculation()
+    model_pgm.create_pgm(input_network_data)
+    model_pgm.create_batch_update_data(path_active_profile, path_reactive_profile)
+    assert _update_data_key(model_pgm.update_data) in model_pgm._validated_keys
+
+
+def test_create_pgm_cached_network():
+    model_pgm = PGMcalculation()
+    model_pgm.create_pgm(input_network_data)
+    hits = _load_network.cache_info().hits
+    model_hits = _build_model.cache_info().hits
+
+    model_pgm_2 = PGMcalculation()
+    model_pgm_2.create_pgm(input_network_data)
+    assert _load_network.cache_info().hits == hits + 1
+    assert _build_model.cache_info().hits == model_hits + 1
+    assert model_pgm_2.model is not model_pgm.model
+
+    # each calculation has its own copy of the input data
+    assert model_pgm_2.input_data is not model_pgm.input_data
+    line, line_2 = model_pgm.input_data["line"], model_pgm_2.input_data["line"]
+    assert all(np.array_equal(line_2[name], line[name], equal_nan=True) for name in line.dtype.names)
+
+
+def test_run_scenarios():
+    model_pgm = PGMcalculation()
+    model_pgm.create_pgm(input_network_data)
+    model_pgm.create_batch_update_data(path_active_profile, path_reactive_profile)
+
+    update_line = initialize_array("update", "line", 1)
+    update_line["id"] = model_pgm.input_data["line"][0]["id"]
+    update_line["to_status"] = [0]
+    scenarios = [{"line": update_line}, {}]
+
+    results = PGMcalculation.run_scenarios(
+        input_network_data, path_active_profile, path_reactive_profile, scenarios, n_procs=2
+    )
+    assert len(results) == 2
+
+    # the scenarios do not affect each other, the empty scenario is the unchanged model
+    model_pgm.run_power_flow_calculation()
+    pd.testing.assert_frame_equal(results[1][0], model_pgm.aggregate_voltages())
+    pd.testing.assert_frame_equal(results[1][1], model_pgm.aggregate_line_loading())
+    model_pgm.update_model({"line": update_line})
+    model_pgm.run_power_flow_calculation()
+    pd.testing.assert_frame_equal(results[0][1], model_pgm.aggregate_line_loading())
+
+
+def test_run_scenarios_invalid_inputs():
+    # invalid inputs raise in the calling process, before any worker process is started
+    with pytest.raises(FileNotFoundError):
+        PGMcalculation.run_scenarios(
+            input_network_data, "tests/data/input/missing_profile.parquet", path_reactive_profile, [{}], n_procs=2
+        )
+
+
+def test_run_scenario_worker():
+    # the worker functions normally only run in the pool processes
+    _init_scenario_worker(PGMcalculation, input_network_data, path_active_profile, path_reactive_profile)
+    voltages, line_loading = _run_scenario({})
+    assert voltages.shape == (10, 4)
+    assert line_loading.shape == (3, 5)
+
+
+def test_aggregate_voltages_categorical_nodes():
+    model_pgm = PGMcalculation()
+    model_pgm.create_pgm(input_network_data)
+    model_pgm.create_batch_update_data(path_active_profile, path_reactive_profile)
+    model_pgm.run_power_flow_calculation()
+
+    voltages = model_pgm.aggregate_voltages()
+    voltages_categorical = model_pgm.aggregate_voltages(categorical_nodes=True)
+    assert isinstance(voltages_categorical["Max_Voltage_Node"].dtype, pd.CategoricalDtype)
+    assert (voltages_categorical["Min_Voltage_Node"].astype(voltages["Min_Voltage_Node"].dtype)).equals(
+        voltages["Min_Voltage_Node"]
+    )
+
+
+def test_prepare():
+    model_pgm = PGMcalculation()
+    model_pgm.create_pgm(input_network_data)
+    model_pgm.create_batch_update_data(path_active_profile, path_reactive_profile)
+
+    model_prepared = PGMcalculation()
+    model_prepared.prepare(input_network_data, path_active_profile, path_reactive_profile)
+    for field in ("id", "p_specified", "q_specified"):
+        assert np.array_equal(model_prepared.update_data["sym_load"][field], model_pgm.update_data["sym_load"][field])
+    assert model_prepared.timestamps.equals(model_pgm.timestamps)
+
+
+def test_sampled_validation_result_invariants(model_pgm):
+    # with the default sampled validation the whole batch and the results still satisfy the invariants
+    model_pgm.create_batch_update_data(path_active_profile, path_reactive_profile)
+    sym_load_update = model_pgm.update_data["sym_load"]
+    assert np.array_equal(np.unique(sym_load_update["id"]), np.sort(model_pgm.input_data["sym_load"]["id"]))
+    assert np.isfinite(sym_load_update["p_specified"]).all()
+    assert np.isfinite(sym_load_update["q_specified"]).all()
+
+    model_pgm.run_power_flow_calculation()
+    voltages = model_pgm.aggregate_voltages()
+    line_loading = model_pgm.aggregate_line_loading()
+    for column in ("Max_Voltage", "Min_Voltage"):
+        assert np.isfinite(voltages[column].to_numpy()).all()
+    for column in ("Total_Loss", "Max_Loading", "Min_Loading"):
+        assert np.isfinite(line_loading[column].to_numpy()).all()
+
+    node_ids = model_pgm.input_data["node"]["id"]
+    assert np.isin(voltages["Max_Voltage_Node"].to_numpy(), node_ids).all()
+    assert np.isin(voltages["Min_Voltage_Node"].to_numpy(), node_ids).all()
+    assert set(line_loading.index) == set(model_pgm.input_data["line"]["id"])
+
+
+def test_sample_batch():
+    update_data = {"sym_load": initialize_array("update", "sym_load", (100, 3))}
+    assert _sample_batch(update_data)["sym_load"].shape == (34, 3)
+    assert _sample_batch(update_data, sample_size=200)["sym_load"].shape == (100, 3)